@@ -1819,7 +1819,7 @@ public partial class MainWindow : Window
 
         try
         {
-            return Directory.GetFiles(dir, $"{baseName}_transcript*")
+            return Directory.GetFiles(dir, $"{baseName}_transcript*.txt")
                 .OrderBy(f => f)
                 .ToList();
         }
@@ -3483,6 +3483,21 @@ public partial class MainWindow : Window
                 await installer.TryRunCommandAsync(
                     "-m pip install Pillow --upgrade --no-warn-script-location --prefer-binary", log);
 
+                // 6. Install PyAV (in-process frame decoding; ffmpeg on PATH is the fallback)
+                log("Installing PyAV...");
+                await installer.TryRunCommandAsync(
+                    "-m pip install av --upgrade --no-warn-script-location --prefer-binary", log);
+
+                // 7. Install bitsandbytes (4-bit/8-bit VLM weights on GPUs with less VRAM)
+                log("Installing bitsandbytes...");
+                await installer.TryRunCommandAsync(
+                    "-m pip install bitsandbytes --upgrade --no-warn-script-location --prefer-binary", log);
+
+                // 8. Install RapidOCR (fast OCR pass; the VLM only reads the frames it can't)
+                log("Installing RapidOCR...");
+                await installer.TryRunCommandAsync(
+                    "-m pip install rapidocr_onnxruntime --upgrade --no-warn-script-location --prefer-binary", log);
+
                 log("\n✅ All VLM dependencies installed successfully!");
                 await CheckTimestampVenvStatusAsync();
                 MessageBox.Show("VLM dependencies installed successfully!", "Success", MessageBoxButton.OK, MessageBoxImage.Information);
@@ -133,6 +133,10 @@ public class PipInstaller
         if (!await TryRunCommandAsync("-m pip install huggingface-hub --upgrade --no-warn-script-location --prefer-binary", onOutput))
             failed.Add("huggingface-hub");
 
+        // Optional: multi-connection model downloads (the engine enables it only when present)
+        onOutput("Installing hf_transfer (optional)...");
+        await TryRunCommandAsync("-m pip install hf_transfer --upgrade --no-warn-script-location --prefer-binary", onOutput);
+
         // Install openai SDK (used for OpenAI and Gemini APIs)
         onOutput("Installing openai SDK...");
         if (!await TryRunCommandAsync("-m pip install openai --upgrade --no-warn-script-location --prefer-binary", onOutput))
@@ -1,11 +1,32 @@
 import argparse
-import torch
+import gc
 import sys
 import os
 import json
+from collections import namedtuple
 from datetime import datetime
 import multiprocessing
 
+# Thread pools are sized when torch/CTranslate2 load, so the OpenMP/MKL hints must be set first
+CPU_THREADS = max(1, multiprocessing.cpu_count() // 2)
+os.environ.setdefault("OMP_NUM_THREADS", str(CPU_THREADS))
+os.environ.setdefault("MKL_NUM_THREADS", str(CPU_THREADS))
+
+# PyTorch grows its CUDA pool in place instead of carving fixed segments, so blocks freed by
+# VAD/embedding runs don't strand fragmented VRAM next to llama.cpp (read at the first CUDA
+# allocation; PyTorch only supports it on Linux)
+if sys.platform.startswith("linux"):
+    os.environ.setdefault("PYTORCH_CUDA_ALLOC_CONF", "expandable_segments:True")
+
+# Multi-connection Hugging Face downloads (Whisper and GGUF models) when hf_transfer is installed;
+# read by huggingface_hub at import, and it errors if the flag is set without the package
+import importlib.util
+if importlib.util.find_spec("hf_transfer") is not None:
+    os.environ.setdefault("HF_HUB_ENABLE_HF_TRANSFER", "1")
+
+# torch and faster_whisper are imported where they are used: importing torch and probing
+# CUDA costs about a second, which search/analysis modes never need
+
 # Force unbuffered output for real-time UI updates
 sys.stdout.reconfigure(encoding='utf-8', line_buffering=True)
 
@@ -22,52 +43,452 @@ if sys.platform == "win32":
     except Exception:
         pass  # Non-fatal: if torch isn't installed yet, faster_whisper import will fail anyway
 
-from faster_whisper import WhisperModel
+# Silero VAD: speech separated by this much silence is split into separate chunks
+VAD_MIN_SILENCE_MS = 2000
+_vad_options = None
+
+def get_vad_options():
+    """Shared Silero VAD settings: built once instead of per call/file."""
+    global _vad_options
+    if _vad_options is None:
+        from faster_whisper.vad import VadOptions
+        _vad_options = VadOptions(min_silence_duration_ms=VAD_MIN_SILENCE_MS)
+    return _vad_options
+
+try:
+    import orjson  # Optional: much faster report (de)serialization
+except ImportError:
+    orjson = None
+
+def write_json_report(path, data):
+    """Write a JSON report as indented UTF-8 (orjson when installed)."""
+    if orjson is not None:
+        with open(path, "wb") as f:
+            f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+    else:
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
+
+def read_json_report(path):
+    """Load a JSON report (orjson when installed)."""
+    if orjson is not None:
+        with open(path, "rb") as f:
+            return orjson.loads(f.read())
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+def append_jsonl(f, entry):
+    """Append one record to a binary line-delimited JSON file and flush it (orjson when installed)."""
+    if orjson is not None:
+        f.write(orjson.dumps(entry) + b"\n")
+    else:
+        f.write(json.dumps(entry, ensure_ascii=False).encode("utf-8") + b"\n")
+    f.flush()
+
+def read_jsonl(path):
+    """Load the records of a line-delimited JSON file, ignoring a torn last line."""
+    records = []
+    with open(path, "rb") as f:
+        for line in f:
+            try:
+                records.append(orjson.loads(line) if orjson is not None else json.loads(line))
+            except ValueError:
+                break  # Interrupted mid-write: everything before it is intact
+    return records
+
+def open_jsonl_append(path):
+    """Open a line-delimited JSON file for appending, first cutting a torn last line."""
+    if os.path.exists(path):
+        with open(path, "r+b") as f:
+            data = f.read()
+            if data and not data.endswith(b"\n"):
+                f.truncate(data.rfind(b"\n") + 1)  # New records must not glue onto the fragment
+    return open(path, "ab")
+
+def dumps_json(data):
+    """Serialize data to a compact JSON string for stdout (orjson when installed)."""
+    if orjson is not None:
+        return orjson.dumps(data).decode("utf-8")
+    return json.dumps(data)
 
 # Device Configuration
-def get_device_config(device_override=None):
+COMPUTE_TYPES = ["auto", "float16", "bfloat16", "int8_float16", "int8", "float32"]
+
+def auto_gpu_compute():
+    """Pick the CUDA compute type from the GPU's compute capability."""
+    import torch
+    major, minor = torch.cuda.get_device_capability()
+    if (major, minor) >= (8, 0):
+        return "bfloat16"       # Ampere+: BF16 tensor cores
+    if (major, minor) >= (7, 5):
+        return "int8_float16"   # Turing: INT8 tensor cores, about half the VRAM of float16
+    return "float16"
+
+# TS_QUANT=int8: INT8 weights everywhere (int8_float16 on GPU) unless --compute-type is given
+QUANTIZE_INT8 = os.environ.get("TS_QUANT", "").lower() == "int8"
+
+def get_device_config(device_override=None, compute_override="auto", quantize=None):
+    import torch
+    if quantize is None:
+        quantize = QUANTIZE_INT8
     if device_override == "cpu":
         print("[INIT] Forced CPU mode.")
-        return "cpu", "int8"
+        device = "cpu"
     elif device_override == "cuda":
         if torch.cuda.is_available():
             print("[INIT] Forced CUDA mode. GPU available.")
-            return "cuda", "float16"
+            device = "cuda"
         else:
             print("[INIT] CUDA requested but not available! Falling back to CPU.")
-            return "cpu", "int8"
+            device = "cpu"
     else:  # auto
         if torch.cuda.is_available():
             print("[INIT] CUDA detected. Using GPU.")
-            return "cuda", "float16"
+            device = "cuda"
         else:
             print("[INIT] CUDA not found. Using CPU.")
-            return "cpu", "int8"
+            device = "cpu"
+
+    if compute_override and compute_override != "auto":
+        compute = compute_override
+    elif quantize:
+        compute = "int8_float16" if device == "cuda" else "int8"
+    elif device == "cuda":
+        compute = auto_gpu_compute()
+    else:
+        compute = "int8"
+    return device, compute
+
+# Resolved on first use (or by the CLI's --device/--compute-type) so that importing
+# this module doesn't create a CUDA context
+DEVICE, COMPUTE = None, None
 
-DEVICE, COMPUTE = get_device_config()
+def ensure_device():
+    """Probe the device once, on the first call that actually needs it."""
+    global DEVICE, COMPUTE
+    if DEVICE is None:
+        DEVICE, COMPUTE = get_device_config()
+
+def configure_torch_backends():
+    """
+    Tune PyTorch's CUDA backends (Silero VAD, embeddings). Whisper itself runs in CTranslate2.
+    Called once from the CLI entry point so plain imports don't create a CUDA context.
+    """
+    if DEVICE != "cuda":
+        return
+    import torch
+    torch.cuda.set_device(0)
+    # Fixed-shape inputs (VAD windows): autotune conv algorithms once and reuse them
+    torch.backends.cudnn.benchmark = True
+    # TF32 tensor cores for the FP32 ops outside CTranslate2 (VAD, embeddings); no-op before Ampere
+    torch.set_float32_matmul_precision("high")
+    torch.backends.cuda.matmul.allow_tf32 = True
+    torch.backends.cudnn.allow_tf32 = True
+    torch.backends.cuda.enable_flash_sdp(True)
+
+def release_cuda_cache():
+    """Return PyTorch's cached CUDA blocks at the end of a batch job (not between files)."""
+    if DEVICE == "cuda":
+        import torch
+        torch.cuda.empty_cache()
 
 MEDIA_EXTENSIONS = {'.mp4', '.mkv', '.avi', '.mov', '.wav', '.mp3', '.flac', '.m4a', '.webm', '.aac', '.wma', '.ogg', '.m4v', '.3gp', '.ts', '.mpg', '.mpeg'}
 
+# Suffixes without the dot, for a single rpartition() per file name during discovery
+MEDIA_EXTS_NODOT = frozenset(e[1:] for e in MEDIA_EXTENSIONS)
+
+# Number of VAD chunks decoded together by BatchedInferencePipeline (1 = sequential decode)
+DEFAULT_BATCH_SIZE = 16
+
+# Concurrent CTranslate2 model replicas (0 = 2 on GPU, 1 on CPU)
+NUM_WORKERS = 0
+
 def load_whisper_model(model_name, device=None, compute=None):
     """Centralized Whisper model loader with error logging and CPU fallback."""
+    from faster_whisper import WhisperModel
+    ensure_device()
     device = device or DEVICE
     compute = compute or COMPUTE
+    workers = NUM_WORKERS or (2 if device == "cuda" else 1)
     try:
         print(f"[MODEL] Loading {model_name} on {device} ({compute})...")
-        return WhisperModel(model_name, device=device, compute_type=compute)
+        return WhisperModel(model_name, device=device, compute_type=compute,
+                            cpu_threads=CPU_THREADS, num_workers=workers)
     except Exception as e:
+        if device == "cuda" and compute != "float16":
+            # Older CTranslate2 builds/GPUs may reject bfloat16 or int8 types; float16 is always supported
+            print(f"[WARNING] {compute} load failed: {e}")
+            return load_whisper_model(model_name, device=device, compute="float16")
         if device == "cuda":
             print(f"[WARNING] GPU load failed: {e}")
             print(f"[MODEL] Falling back to CPU (int8)...")
-            return WhisperModel(model_name, device="cpu", compute_type="int8")
+            return WhisperModel(model_name, device="cpu", compute_type="int8",
+                                cpu_threads=CPU_THREADS, num_workers=NUM_WORKERS or 1)
         raise
 
-def find_media_files(directory):
-    """Recursively find all media files in a directory."""
+# Scout passes only need speech/non-speech fidelity: INT8 weights with FP16 activations on GPU
+SCOUT_COMPUTE = "int8_float16"
+
+def load_scout_model():
+    """Load tiny.en for scout scans (SCOUT_COMPUTE on GPU, default compute on CPU)."""
+    ensure_device()
+    compute = SCOUT_COMPUTE if DEVICE == "cuda" else COMPUTE
+    return load_whisper_model("tiny.en", compute=compute)
+
+# Whisper models loaded by this process, keyed by (model_name, device, compute type)
+_model_cache = {}
+
+def get_cached_model(model_name):
+    """Load a Whisper model once per process; every later mode/call reuses the resident copy."""
+    ensure_device()
+    key = (model_name, DEVICE, SCOUT_COMPUTE if model_name == "tiny.en" else COMPUTE)
+    if key not in _model_cache:
+        _model_cache[key] = load_scout_model() if model_name == "tiny.en" else load_whisper_model(model_name)
+    return _model_cache[key]
+
+def use_batching(model, batch_size):
+    """Batch only on GPU: on CPU the padded batches are slower than sequential decoding."""
+    return bool(batch_size) and batch_size > 1 and model.model.device == "cuda"
+
+# Auto batch size for large models: (GB of VRAM still free with the model loaded, batch size).
+# Smaller models (turbo, medium and below) use twice the batch at the same free memory.
+BATCH_SIZE_BY_FREE_VRAM = ((20, 16), (12, 8), (6, 4), (3, 2))
+
+def pick_batch_size(model, model_name):
+    """Batch size for a loaded model from the VRAM left over after loading it (1 on CPU)."""
+    if model.model.device != "cuda":
+        return 1
+    import torch
+    free_gb = torch.cuda.mem_get_info()[0] / 1024**3
+    scale = 1 if "large" in model_name and "turbo" not in model_name else 2
+    batch_size = next((size * scale for gb, size in BATCH_SIZE_BY_FREE_VRAM if free_gb >= gb), 1)
+    print(f"[BATCH] Auto batch size: {batch_size} ({free_gb:.1f} GB VRAM free)")
+    return batch_size
+
+def get_batched_pipeline(model):
+    """BatchedInferencePipeline for a model, created once and kept on the model for every later file."""
+    pipeline = getattr(model, "_turbo_batched_pipeline", None)
+    if pipeline is None:
+        from faster_whisper import BatchedInferencePipeline
+        pipeline = BatchedInferencePipeline(model=model)
+        model._turbo_batched_pipeline = pipeline
+    return pipeline
+
+def transcribe_audio(model, audio, use_vad=True, batch_size=DEFAULT_BATCH_SIZE, **opts):
+    """
+    Transcribe a file path or 16kHz waveform.
+    With VAD on and batching enabled (GPU, batch_size > 1), the speech chunks are decoded
+    together through BatchedInferencePipeline; otherwise falls back to sequential model.transcribe().
+    """
+    opts["vad_filter"] = use_vad
+
+    # The batched pipeline needs VAD chunks to batch (it rejects >30s audio without them)
+    if use_vad and use_batching(model, batch_size):
+        # Passed as a dict: only then does the pipeline cap speech chunks at its 30s window
+        # (a VadOptions instance keeps max_speech_duration_s=inf, and longer chunks get trimmed)
+        opts["vad_parameters"] = {"min_silence_duration_ms": VAD_MIN_SILENCE_MS}
+        return get_batched_pipeline(model).transcribe(audio, batch_size=batch_size, **opts)
+
+    if use_vad:
+        opts["vad_parameters"] = get_vad_options()
+
+    return model.transcribe(audio, **opts)
+
+# Set by --quiet: skip echoing every transcribed segment to stdout
+QUIET_SEGMENTS = False
+
+def emit(lines):
+    """Write several newline-terminated output lines with one write and one flush."""
+    if lines:
+        sys.stdout.write("".join(lines))
+        sys.stdout.flush()
+
+def write_transcript_stream(out_path, header, segments, offset=0.0):
+    """
+    Write segments to out_path as they are decoded, without holding the transcript
+    in memory. The file is only created once the first segment arrives (silent
+    media leaves nothing behind) and goes through a .part file, so an interrupted
+    run never leaves a truncated transcript that --skip-existing would trust.
+    Returns the number of lines written.
+    """
+    f = None
+    count = 0
+    ok = False
+    tmp_path = out_path + ".part"
+    try:
+        for s in segments:
+            if f is None:
+                f = open(tmp_path, "w", encoding="utf-8", buffering=TRANSCRIPT_WRITE_BUFFER)
+                f.write(header)
+            text = s.text.strip()
+            start, end = s.start + offset, s.end + offset
+            f.write(f"[{start:.2f} - {end:.2f}] {text}\n")
+            if not QUIET_SEGMENTS:
+                sys.stdout.write(f"[TEXT] {start:.2f}|{end:.2f}|{text}\n")
+            count += 1
+        ok = True
+    finally:
+        if f is not None:
+            f.close()
+            finish_part_file(out_path, ok and count > 0)
+    return count
+
+# Clips this short fit in one Whisper window and can be batched across files
+SHORT_CLIP_SAMPLES = 30 * 16000
+# Clip batches don't straddle this length: a few-second clip decodes few tokens and
+# shouldn't wait on a batch padded out to a 30s clip's decode
+SHORT_CLIP_BUCKET_SAMPLES = 10 * 16000
+
+def transcribe_clip_batch(model, clips, beam_size=5):
+    """
+    Decode several <=30s waveforms in a single CTranslate2 generate() call.
+    Returns one text per clip (no per-segment timestamps).
+    """
+    import numpy as np
+    from faster_whisper.audio import pad_or_trim
+    from faster_whisper.tokenizer import Tokenizer
+
+    features = np.stack([pad_or_trim(model.feature_extractor(clip)) for clip in clips])
+    encoder_output = model.encode(features)
+
+    if model.model.is_multilingual:
+        # detect_language returns [("<|en|>", prob), ...] per clip
+        languages = [r[0][0][2:-2] for r in model.model.detect_language(encoder_output)]
+    else:
+        languages = ["en"] * len(clips)
+
+    tokenizers = [Tokenizer(model.hf_tokenizer, model.model.is_multilingual, task="transcribe", language=lang)
+                  for lang in languages]
+    prompts = [model.get_prompt(tok, [], without_timestamps=True) for tok in tokenizers]
+    results = model.model.generate(encoder_output, prompts, beam_size=beam_size, return_scores=True)
+    return [tok.decode(r.sequences_ids[0]).strip() for tok, r in zip(tokenizers, results)]
+
+def probe_duration(file_path):
+    """Container duration in seconds read from metadata via PyAV (no decode); 0.0 if unknown."""
+    import av
+    try:
+        with av.open(file_path) as container:
+            return container.duration / 1_000_000 if container.duration else 0.0
+    except Exception:
+        return 0.0
+
+# Files decoded ahead of the one on the GPU in batch transcription
+PREFETCH_DEPTH = 2
+
+def prefetch_audio(file_paths, depth=PREFETCH_DEPTH, loader=None, workers=1):
+    """
+    Yield (file_path, future_of_16kHz_waveform) in order, decoding up to `depth`
+    files ahead on background threads so CPU decode overlaps GPU transcription.
+    loader(path) replaces faster-whisper's decode_audio (e.g. the ffmpeg VAD loader).
+    """
+    from collections import deque
+    from concurrent.futures import ThreadPoolExecutor
+    if loader is None:
+        from faster_whisper.audio import decode_audio
+        loader = lambda path: decode_audio(path, sampling_rate=16000)
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        remaining = iter(file_paths)
+        pending = deque()
+        for path in remaining:
+            pending.append((path, pool.submit(loader, path)))
+            if len(pending) >= depth:
+                break
+        while pending:
+            path, future = pending.popleft()
+            next_path = next(remaining, None)
+            if next_path is not None:
+                pending.append((next_path, pool.submit(loader, next_path)))
+            yield path, future
+
+# Directory listings are I/O bound (especially on network shares): list subfolders in parallel
+SCAN_WORKERS = 16
+
+# Per-file [ACCEPT] lines in scan_debug.log (TURBOSCRIBE_DEBUG_SCAN=1); off by default
+DEBUG_SCAN = os.environ.get("TURBOSCRIBE_DEBUG_SCAN", "0") == "1"
+
+def _scan_media_dir(directory):
+    """List one directory level. Returns (media_files, subdirs, log_lines)."""
+    media_files = []
+    subdirs = []
+    log_lines = [f"\nVisiting: {directory}\n"]
+    # Hoisted bound methods: this loop runs once per file in the tree
+    media_append = media_files.append
+    log_append = log_lines.append
+    try:
+        with os.scandir(directory) as it:
+            for entry in it:
+                # Follow symlinks to find files in symlinked folders
+                try:
+                    if entry.is_dir(follow_symlinks=True):
+                        subdirs.append(entry.path)
+                        continue
+                except OSError:
+                    continue
+                name = entry.name
+                # A leading dot alone (".mp3") is a hidden file, not an extension
+                stem, _, ext = name.rpartition('.')
+                # Exact-case set lookup first: lowercase media names never allocate a lowered copy
+                if stem and (ext in MEDIA_EXTS_NODOT or ext.lower() in MEDIA_EXTS_NODOT):
+                    media_append(entry.path)
+                    if DEBUG_SCAN:
+                        log_append(f"  [ACCEPT] {name}\n")
+    except OSError as e:
+        log_lines.append(f"  [ERROR] {e}\n")
+    return media_files, subdirs, log_lines
+
+# Derived data (scan index, search caches) lives here: never beside the user's media or transcripts
+# (the app lists those folders) nor next to a frozen install, which is read-only or temporary
+CACHE_DIR = os.environ.get("TS_CACHE_DIR") or os.path.join(
+    os.environ.get("LOCALAPPDATA") or os.path.join(os.path.expanduser("~"), ".cache"), "LongAudioApp", "Cache")
+
+def cache_path(source_path, suffix):
+    """
+    Path in CACHE_DIR for data derived from source_path (keyed by its absolute path).
+    A list of paths is keyed by the whole set, in any order.
+    """
+    import hashlib
+    if isinstance(source_path, (list, tuple)):
+        key = "\n".join(sorted({os.path.abspath(p) for p in source_path}))
+    else:
+        key = os.path.abspath(source_path)
+    digest = hashlib.sha1(key.encode("utf-8")).hexdigest()
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+    except OSError:
+        pass  # Callers already treat an unwritable cache as a miss
+    return os.path.join(CACHE_DIR, digest + suffix)
+
+# Folder listings remembered between re-scans, one cache entry per scanned root: a folder is listed
+# again only if its mtime changed (adding, removing or renaming an entry updates its folder's mtime)
+SCAN_INDEX_SUFFIX = ".scanidx.json"
+
+def _scan_media_dir_indexed(directory, index):
+    """
+    _scan_media_dir answered from the index when the folder is unchanged.
+    Returns (media_files, subdirs, log_lines, index_entry); index_entry is [mtime_ns, media_files, subdirs].
+    """
+    try:
+        mtime = os.stat(directory).st_mtime_ns  # Taken before listing: a change mid-listing forces a re-list next time
+    except OSError:
+        return _scan_media_dir(directory) + (None,)
+    cached = index.get(directory)
+    if cached and cached[0] == mtime:
+        return cached[1], cached[2], [], cached
+    media_files, subdirs, log_lines = _scan_media_dir(directory)
+    return media_files, subdirs, log_lines, [mtime, media_files, subdirs]
+
+def find_media_files(directory, use_index=False):
+    """
+    Recursively find all media files in a directory.
+    use_index: reuse unchanged folder listings from the root's scan index (for --skip-existing re-scans).
+    """
+    from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
     # Robustly handle potential argument parsing artifacts (e.g. trailing quotes)
     if directory.endswith('"'): directory = directory[:-1]
     
-    # Normalize bare drive letters: 'C:' -> 'C:\' (otherwise os.walk uses CWD on that drive)
+    # Normalize bare drive letters: 'C:' -> 'C:\' (otherwise the listing uses CWD on that drive)
     if len(directory) == 2 and directory[1] == ':':
         directory = directory + os.sep
     elif not os.path.isabs(directory):
@@ -77,74 +498,215 @@ def find_media_files(directory):
     debug_log_path = os.path.join(os.path.dirname(os.path.abspath(directory)), "scan_debug.log")
     
     media_files = []
+    log_lines = [f"Scanning directory: {directory}\n", f"Extensions: {MEDIA_EXTENSIONS}\n"]
     
+    index, new_index = {}, {}
+    index_path = cache_path(directory, SCAN_INDEX_SUFFIX) if use_index else None
+    if use_index and os.path.exists(index_path):
+        try:
+            index = read_json_report(index_path)
+        except Exception as e:
+            print(f"[DEBUG] Ignoring unreadable scan index: {e}")
+
     try:
-        with open(debug_log_path, "w", encoding="utf-8") as log:
-            log.write(f"Scanning directory: {directory}\n")
-            log.write(f"Extensions: {MEDIA_EXTENSIONS}\n")
-            
-            # Enable followlinks to find files in symlinked folders
-            for root, dirs, files in os.walk(directory, followlinks=True):
-                log.write(f"\nVisiting: {root}\n")
-                for f in files:
-                    ext = os.path.splitext(f)[1].lower()
-                    if ext in MEDIA_EXTENSIONS:
-                        full_path = os.path.join(root, f)
-                        media_files.append(full_path)
-                        log.write(f"  [ACCEPT] {f}\n")
-                    else:
-                        log.write(f"  [IGNORE] {f} ({ext})\n")
+        with ThreadPoolExecutor(max_workers=SCAN_WORKERS) as pool:
+            def submit(d):
+                if use_index:
+                    future = pool.submit(_scan_media_dir_indexed, d, index)
+                else:
+                    future = pool.submit(_scan_media_dir, d)
+                future.directory = d
+                return future
+
+            pending = {submit(directory)}
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    result = future.result()
+                    found, subdirs, lines = result[:3]
+                    media_files.extend(found)
+                    log_lines.extend(lines)
+                    if use_index and result[3] is not None:
+                        new_index[future.directory] = result[3]
+                    pending.update(submit(d) for d in subdirs)
+
+        if use_index:
+            # The root's index is replaced by what this walk saw (deleted folders drop out)
+            try:
+                write_json_report(index_path, new_index)
+            except OSError as e:
+                print(f"[DEBUG] Could not save scan index: {e}")
+
+        if DEBUG_SCAN:
+            # One pre-encoded write for the whole tree through a large buffer
+            with open(debug_log_path, "wb", buffering=8 * 1024 * 1024) as log:
+                log.write("".join(log_lines).encode("utf-8"))
     except Exception as e:
         print(f"[ERROR] Discovery failed: {e}")
-        try:
-             with open(debug_log_path, "a", encoding="utf-8") as log:
-                 log.write(f"[ERROR] {e}\n")
-        except: pass
+        if DEBUG_SCAN:
+            try:
+                 with open(debug_log_path, "a", encoding="utf-8") as log:
+                     log.write(f"[ERROR] {e}\n")
+            except: pass
 
     media_files.sort()
     return media_files
 
-def cluster_segments(segments, gap_threshold=180):
-    """Cluster segments into blocks. Gap > gap_threshold seconds = new block."""
-    blocks = []
-    current_start = -1
-    last_end = -1
-    segment_count = 0
+# Minimal stand-in for faster_whisper's Segment: cluster_segments only reads start/end
+SpeechSegment = namedtuple("SpeechSegment", ["start", "end"])
+
+def detect_speech_segments(file_path, min_silence_duration_ms=2000):
+    """
+    Find speech regions with faster-whisper's Silero VAD on the decoded PCM,
+    without running the Whisper encoder/decoder.
+    Returns (segments_in_seconds, total_duration_sec).
+    """
+    from faster_whisper.audio import decode_audio
+    from faster_whisper.vad import get_speech_timestamps
 
-    for segment in segments:
-        segment_count += 1
-        if current_start == -1:
-            current_start = segment.start
+    audio = decode_audio(file_path, sampling_rate=16000)
+    if min_silence_duration_ms == VAD_MIN_SILENCE_MS:
+        vad_options = get_vad_options()
+    else:
+        from faster_whisper.vad import VadOptions
+        vad_options = VadOptions(min_silence_duration_ms=min_silence_duration_ms)
+    timestamps = get_speech_timestamps(audio, vad_options)
+    segments = [SpeechSegment(t["start"] / 16000, t["end"] / 16000) for t in timestamps]
+    return segments, len(audio) / 16000.0
 
-        if last_end != -1 and (segment.start - last_end) > gap_threshold:
-            blocks.append({"start": round(current_start, 2), "end": round(last_end, 2)})
-            current_start = segment.start
+def cluster_segments(segments, gap_threshold=180, max_blocks=None):
+    """
+    Cluster segments into blocks. Gap > gap_threshold seconds = new block.
+    With max_blocks, stops pulling segments once that many blocks are complete;
+    on a lazy faster-whisper generator this also stops the decode.
+    """
+    import numpy as np
 
-        last_end = segment.end
+    # Materialize first: segments may be a lazy generator that drives decoding
+    if max_blocks:
+        pairs = []
+        cuts = 0
+        for s in segments:
+            if pairs and s.start - pairs[-1][1] > gap_threshold:
+                cuts += 1
+                if cuts >= max_blocks:
+                    break
+            pairs.append((s.start, s.end))
+        spans = np.array(pairs, dtype=np.float64).reshape(-1, 2)
+    else:
+        # Flat start/end stream straight into one float64 buffer: no per-segment tuples
+        spans = np.fromiter((t for s in segments for t in (s.start, s.end)), dtype=np.float64).reshape(-1, 2)
+    segment_count = len(spans)
+    if segment_count == 0:
+        return [], 0
 
-    if current_start != -1:
-        blocks.append({"start": round(current_start, 2), "end": round(last_end, 2)})
+    starts, ends = spans[:, 0], spans[:, 1]
+    cuts = np.flatnonzero(starts[1:] - ends[:-1] > gap_threshold) + 1
+    block_starts = np.round(starts[np.concatenate(([0], cuts))], 2)
+    block_ends = np.round(ends[np.concatenate((cuts - 1, [segment_count - 1]))], 2)
 
+    blocks = [{"start": start, "end": end} for start, end in zip(block_starts.tolist(), block_ends.tolist())]
     return blocks, segment_count
 
 
 # ===== SILERO VAD-ONLY SCAN (no Whisper) =====
 
+# Silero backend for vad_scan: "onnx" (faster-whisper's bundled ONNX Runtime model),
+# "jit" (TorchScript via torch.hub) or "auto" (ONNX on CPU, JIT on CUDA)
+VAD_BACKEND = os.environ.get("TS_VAD_BACKEND", "auto").lower()
+
 _vad_model = None
+_vad_backend = "jit"
+_vad_device = "cpu"  # Where _vad_model runs ("cuda" when a GPU is in use)
+_vad_half = False    # FP16 weights/inputs on the GPU
+# Local checkout of the Silero hub repo, resolved once by the parent so Pool workers
+# load it with source="local" instead of racing each other on the torch.hub cache
+_vad_hub_dir = None
 
 def _load_vad_model():
-    """Load Silero VAD model (cached after first load)."""
-    global _vad_model
+    """Load Silero VAD model (cached after first load). On CUDA it runs on the GPU in FP16."""
+    global _vad_model, _vad_backend, _vad_device, _vad_half
     if _vad_model is None:
+        ensure_device()
+        backend = VAD_BACKEND if VAD_BACKEND in ("onnx", "jit") else ("jit" if DEVICE == "cuda" else "onnx")
+        if backend == "onnx":
+            try:
+                from faster_whisper.vad import get_vad_model
+                print("[VAD] Loading Silero VAD model (ONNX Runtime)...")
+                _vad_model, _vad_backend = get_vad_model(), "onnx"
+                return _vad_model
+            except Exception as e:
+                print(f"[VAD] ONNX VAD not available ({e}), using TorchScript")
         import torch
         print("[VAD] Loading Silero VAD model...")
-        _vad_model, _ = torch.hub.load(repo_or_dir='snakers4/silero-vad', model='silero_vad', trust_repo=True)
+        if _vad_hub_dir:
+            _vad_model, _ = torch.hub.load(repo_or_dir=_vad_hub_dir, model='silero_vad', source='local')
+        else:
+            _vad_model, _ = torch.hub.load(repo_or_dir='snakers4/silero-vad', model='silero_vad', trust_repo=True)
+        _vad_backend = "jit"
+        if DEVICE == "cuda":
+            try:
+                _vad_model = _vad_model.to("cuda").half()
+                _vad_device, _vad_half = "cuda", True
+            except Exception as e:
+                print(f"[VAD] GPU not usable for VAD ({e}), staying on CPU")
+                _vad_model = _vad_model.to("cpu").float()
+        _warm_up_vad_model(_vad_model)
     return _vad_model
 
+# Silent audio run through a freshly loaded TorchScript VAD so graph optimization happens at load time
+VAD_WARMUP_SECONDS = 2
+
+def _warm_up_vad_model(model):
+    """
+    The TorchScript profiling executor specializes the graph over its first runs
+    (and cuDNN autotunes on CUDA): do that on silence, not on the first real file.
+    """
+    import torch
+    try:
+        silence = torch.zeros(VAD_WARMUP_SECONDS * 16000)
+        for _ in range(2):
+            _run_vad_model(model, silence, 0.5)
+        if hasattr(model, "reset_states"):
+            model.reset_states()
+    except Exception as e:
+        print(f"[VAD] Warm-up skipped: {e}")
+
+def _run_onnx_vad(wav, threshold):
+    """Speech timestamps (seconds) from the ONNX model, with the Silero JIT defaults for padding and gaps."""
+    from faster_whisper.vad import VadOptions, get_speech_timestamps
+    options = VadOptions(threshold=threshold, min_speech_duration_ms=250,
+                         min_silence_duration_ms=100, speech_pad_ms=30)
+    return [{"start": round(t["start"] / 16000, 1), "end": round(t["end"] / 16000, 1)}
+            for t in get_speech_timestamps(wav.numpy(), options)]
+
+# RuntimeError text torch uses for Half/Float mismatches (anything else is a real failure)
+_DTYPE_ERROR_MARKERS = ("Half", "dtype", "scalar type", "should be the same")
+
+def _run_vad_model(model, wav, threshold):
+    """Run Silero on its device; drops to FP32 once if the JIT graph rejects half precision."""
+    global _vad_half
+    if _vad_backend == "onnx":
+        return _run_onnx_vad(wav, threshold)
+    x = wav.to(_vad_device, non_blocking=True)
+    try:
+        return model(x.half() if _vad_half else x, 16000, threshold=threshold, return_seconds=True)
+    except RuntimeError as e:
+        if not _vad_half or not any(m in str(e) for m in _DTYPE_ERROR_MARKERS):
+            raise  # e.g. CUDA out of memory: FP32 would not help
+        print(f"[VAD] FP16 rejected ({e}), using FP32 on {_vad_device}")
+        model.float()
+        _vad_half = False
+        return model(x, 16000, threshold=threshold, return_seconds=True)
+
+# ffmpeg stdout pipe buffer: large reads mean few syscalls for hours of PCM
+FFMPEG_PIPE_BUFFER = 1 << 20
+
 def _load_audio_as_tensor(file_path):
     """Load audio file as 16kHz mono float32 tensor using ffmpeg."""
     import torch
     import subprocess
+    import numpy as np
     cmd = [
         'ffmpeg', '-i', file_path,
         '-f', 's16le', '-acodec', 'pcm_s16le',
@@ -152,36 +714,110 @@ def _load_audio_as_tensor(file_path):
         '-v', 'quiet',
         '-'
     ]
-    proc = subprocess.run(cmd, capture_output=True, timeout=600)
+    proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, bufsize=FFMPEG_PIPE_BUFFER)
+    try:
+        # PCM is read straight from the pipe; frombuffer below views it without a copy
+        pcm, err = proc.communicate(timeout=600)
+    except subprocess.TimeoutExpired:
+        proc.kill()
+        proc.communicate()
+        raise RuntimeError("ffmpeg timed out")
     if proc.returncode != 0:
-        raise RuntimeError(f"ffmpeg failed: {proc.stderr.decode()[:200]}")
-    import numpy as np
-    audio = np.frombuffer(proc.stdout, dtype=np.int16).astype(np.float32) / 32768.0
+        raise RuntimeError(f"ffmpeg failed: {err.decode(errors='replace')[:200]}")
+
+    raw = np.frombuffer(pcm, dtype=np.int16)
+    # Fused int16 -> float32 cast and scale: one output array, no float temporaries
+    audio = np.empty(raw.shape, dtype=np.float32)
+    np.multiply(raw, np.float32(1.0 / 32768.0), out=audio, casting='unsafe')
     return torch.from_numpy(audio), len(audio) / 16000.0
 
-def run_vad_scan(file_path, threshold=0.5):
+def run_vad_scan(file_path, threshold=0.5, loaded=None):
     """
     Use Silero VAD to detect speech segments without transcription.
+    loaded: (wav, total_duration) from _load_audio_as_tensor, if already decoded.
     Returns (speech_timestamps, speech_duration_sec, total_duration_sec)
     """
-    import torch
     model = _load_vad_model()
-    wav, total_duration = _load_audio_as_tensor(file_path)
+    wav, total_duration = loaded if loaded is not None else _load_audio_as_tensor(file_path)
     
     # Get speech timestamps
-    speech_timestamps = model(wav, 16000, threshold=threshold, return_seconds=True)
+    speech_timestamps = _run_vad_model(model, wav, threshold)
     # model() with return_seconds returns list of dicts with 'start' and 'end' in seconds
     
     speech_duration = sum(t['end'] - t['start'] for t in speech_timestamps)
     
     return speech_timestamps, speech_duration, total_duration
 
-def run_batch_vad_scan(directory, threshold=0.5, report_path=None, skip_existing=False):
+# vad_scan --jobs default: CPU-only boxes decode and run Silero on several files at once
+VAD_SCAN_JOBS = max(1, min(multiprocessing.cpu_count() // 2, 8))
+
+def _vad_scan_entry(file_path, threshold, loaded=None):
+    """Run the VAD scan on one file and build its report entry (errors become an "error" entry)."""
+    try:
+        timestamps, speech_dur, total_dur = run_vad_scan(file_path, threshold=threshold, loaded=loaded)
+    except Exception as e:
+        return {"file": file_path, "error": str(e)}
+
+    if timestamps:
+        # Convert timestamps to blocks format
+        blocks = [{"start": round(t['start'], 2), "end": round(t['end'], 2)} for t in timestamps]
+        return {
+            "file": file_path,
+            "duration_sec": round(total_dur, 1),
+            "segments_found": len(timestamps),
+            "speech_duration_sec": round(speech_dur, 1),
+            "blocks": blocks,
+            "transcribe_cmds": []
+        }
+    return {
+        "file": file_path,
+        "duration_sec": round(total_dur, 1),
+        "segments_found": 0,
+        "speech_duration_sec": 0,
+        "blocks": []
+    }
+
+def _print_vad_entry(entry):
+    if "error" in entry:
+        print(f"  [ERROR] {entry['error']}")
+    elif entry["segments_found"]:
+        print(f"  [VOICE] {entry['segments_found']} segments, {entry['speech_duration_sec']:.1f}s speech / {entry['duration_sec']:.1f}s total")
+    else:
+        print(f"  [SILENT] No speech detected")
+
+def _resolve_vad_hub_dir():
+    """Fetch the Silero VAD hub repo (if not cached yet) and return its local path, or None."""
+    import glob
+    import torch
+    try:
+        torch.hub.list('snakers4/silero-vad', trust_repo=True, skip_validation=True)
+    except Exception as e:
+        print(f"[VAD] Could not prefetch Silero VAD ({e}), workers will load it themselves")
+        return None
+    found = glob.glob(os.path.join(torch.hub.get_dir(), "snakers4_silero-vad_*"))
+    return max(found, key=os.path.getmtime) if found else None
+
+def _vad_worker_init(threads, hub_dir=None):
+    """Pool initializer: VAD workers stay on the CPU and split the cores between them."""
+    global DEVICE, COMPUTE, _vad_hub_dir
+    import torch
+    DEVICE, COMPUTE = "cpu", "int8"
+    _vad_hub_dir = hub_dir
+    torch.set_num_threads(threads)
+
+def _vad_scan_job(args):
+    """Scan one file in a Pool worker; the Silero model loads once per worker process."""
+    file_path, threshold = args
+    return _vad_scan_entry(file_path, threshold)
+
+def run_batch_vad_scan(directory, threshold=0.5, report_path=None, skip_existing=False, jobs=1):
     """
     Scan all media files in directory using Silero VAD (no Whisper).
     Outputs JSON report compatible with existing format.
+    jobs > 1 scans that many files at once in worker processes (CPU only;
+    on CUDA one process sharing the GPU is faster).
     """
-    media_files = find_media_files(directory)
+    media_files = find_media_files(directory, use_index=skip_existing)
     total = len(media_files)
     print(f"[VAD-SCAN] Found {total} media files in: {directory}")
     print(f"[VAD-SCAN] Sensitivity threshold: {threshold}")
@@ -193,69 +829,98 @@ def run_batch_vad_scan(directory, threshold=0.5, report_path=None, skip_existing
     existing_results = {}
     if skip_existing and os.path.exists(report_path):
         try:
-            with open(report_path, "r", encoding="utf-8") as f:
-                data = json.load(f)
-                if "results" in data:
-                    for r in data["results"]:
-                        if "file" in r:
-                            existing_results[r["file"]] = r
+            data = read_json_report(report_path)
+            if "results" in data:
+                for r in data["results"]:
+                    if "file" in r:
+                        existing_results[r["file"]] = r
             print(f"[VAD-SCAN] Loaded {len(existing_results)} existing results for skipping.")
         except Exception as e:
             print(f"[VAD-SCAN] Failed to load existing report: {e}")
 
+    # Per-file progress log: survives a crash and is folded into the report at the end
+    progress_path = report_path + ".jsonl"
+    if skip_existing and os.path.exists(progress_path):
+        try:
+            recovered = [r for r in read_jsonl(progress_path) if "file" in r]
+            for r in recovered:
+                existing_results[r["file"]] = r
+            print(f"[VAD-SCAN] Recovered {len(recovered)} results from an interrupted scan.")
+        except OSError as e:
+            print(f"[VAD-SCAN] Failed to read progress log: {e}")
+
+    os.makedirs(os.path.dirname(os.path.abspath(report_path)), exist_ok=True)
+    progress = open_jsonl_append(progress_path) if skip_existing else open(progress_path, "wb")
+
     results = []
     files_with_voice = 0
 
-    for i, file_path in enumerate(media_files, 1):
-        # Skip if already scanned
-        if skip_existing and file_path in existing_results:
-            prev = existing_results[file_path]
-            if "error" not in prev:
+    def already_scanned(path):
+        return skip_existing and path in existing_results and "error" not in existing_results[path]
+
+    pending = [p for p in media_files if not already_scanned(p)]
+    ensure_device()
+    if jobs > 1 and DEVICE != "cuda" and len(pending) > 1:
+        jobs = min(jobs, len(pending))
+        print(f"[VAD-SCAN] Scanning with {jobs} worker processes")
+        entries = {}
+        done = 0
+        for file_path in media_files:
+            if already_scanned(file_path):
+                done += 1
+                print(f"\n[{done}/{total}] Skipping (already scanned): {os.path.basename(file_path)}")
+        # CPU workers only use the TorchScript model if asked to (or if ONNX Runtime is missing)
+        hub_dir = None
+        if VAD_BACKEND == "jit" or importlib.util.find_spec("onnxruntime") is None:
+            hub_dir = _resolve_vad_hub_dir()
+        with multiprocessing.Pool(jobs, initializer=_vad_worker_init, initargs=(max(1, CPU_THREADS // jobs), hub_dir)) as pool:
+            for entry in pool.imap_unordered(_vad_scan_job, [(p, threshold) for p in pending]):
+                done += 1
+                print(f"\n[{done}/{total}] VAD scanned: {os.path.basename(entry['file'])}")
+                _print_vad_entry(entry)
+                append_jsonl(progress, entry)
+                entries[entry["file"]] = entry
+        # Report keeps directory order, whatever order the workers finished in
+        for file_path in media_files:
+            entry = existing_results[file_path] if already_scanned(file_path) else entries[file_path]
+            results.append(entry)
+            if entry.get("segments_found", 0) > 0:
+                files_with_voice += 1
+    else:
+        # ffmpeg decodes the next files (in separate processes) while VAD runs on this one;
+        # VAD itself stays on this thread
+        _load_vad_model()
+        decoded = prefetch_audio(pending, loader=_load_audio_as_tensor, workers=2)
+
+        for i, file_path in enumerate(media_files, 1):
+            # Skip if already scanned
+            if already_scanned(file_path):
+                prev = existing_results[file_path]
                 print(f"\n[{i}/{total}] Skipping (already scanned): {os.path.basename(file_path)}")
                 results.append(prev)
                 if prev.get("segments_found", 0) > 0:
                     files_with_voice += 1
                 continue
 
-        print(f"\n[{i}/{total}] VAD scanning: {os.path.basename(file_path)}")
-
-        try:
-            timestamps, speech_dur, total_dur = run_vad_scan(file_path, threshold=threshold)
-
-            if timestamps:
-                files_with_voice += 1
-                # Convert timestamps to blocks format
-                blocks = [{"start": round(t['start'], 2), "end": round(t['end'], 2)} for t in timestamps]
-                
-                entry = {
-                    "file": file_path,
-                    "duration_sec": round(total_dur, 1),
-                    "segments_found": len(timestamps),
-                    "speech_duration_sec": round(speech_dur, 1),
-                    "blocks": blocks,
-                    "transcribe_cmds": []
-                }
-                print(f"  [VOICE] {len(timestamps)} segments, {speech_dur:.1f}s speech / {total_dur:.1f}s total")
-                results.append(entry)
+            print(f"\n[{i}/{total}] VAD scanning: {os.path.basename(file_path)}")
+            _, audio_future = next(decoded)
+            try:
+                loaded = audio_future.result()
+            except Exception as e:
+                entry = {"file": file_path, "error": str(e)}
             else:
-                print(f"  [SILENT] No speech detected")
-                results.append({
-                    "file": file_path,
-                    "duration_sec": round(total_dur, 1),
-                    "segments_found": 0,
-                    "speech_duration_sec": 0,
-                    "blocks": []
-                })
+                entry = _vad_scan_entry(file_path, threshold, loaded)
+            _print_vad_entry(entry)
+            append_jsonl(progress, entry)
+            results.append(entry)
+            if entry.get("segments_found", 0) > 0:
+                files_with_voice += 1
 
-        except Exception as e:
-            print(f"  [ERROR] {e}")
-            results.append({
-                "file": file_path,
-                "error": str(e)
-            })
+        decoded.close()
+        release_cuda_cache()
+    progress.close()
 
     # Write JSON report
-    os.makedirs(os.path.dirname(os.path.abspath(report_path)), exist_ok=True)
 
     report = {
         "date": datetime.now().isoformat(),
@@ -267,33 +932,34 @@ def run_batch_vad_scan(directory, threshold=0.5, report_path=None, skip_existing
         "vad_threshold": threshold
     }
 
-    with open(report_path, "w", encoding="utf-8") as f:
-        json.dump(report, f, indent=2, ensure_ascii=False)
+    write_json_report(report_path, report)
+    # The full report now holds everything the progress log did
+    try:
+        os.remove(progress_path)
+    except OSError:
+        pass
 
     print(f"\n[VAD-SCAN] Complete: {files_with_voice}/{total} files with voice")
     print(f"[VAD-SCAN] Report saved to: {report_path}")
 
 
-def run_scanner(file_path, use_vad=True, beam_size=1):
+def run_scanner(file_path, use_vad=True, beam_size=1, max_blocks=None):
     """
     MODE 1: SCOUT (Speed)
-    Scans using Tiny Model with optional VAD.
+    Finds speech blocks with Silero VAD alone; with VAD off (noisy audio)
+    falls back to a Tiny model decode. max_blocks stops after the first N
+    blocks (e.g. for a UI preview).
     """
     print(f"[STATUS] Scanning {file_path}...")
     print(f"[STATUS] VAD: {'ON' if use_vad else 'OFF'}")
 
-    model = load_whisper_model("tiny.en")
-
-    transcribe_opts = dict(
-        vad_filter=use_vad,
-        beam_size=beam_size
-    )
     if use_vad:
-        transcribe_opts["vad_parameters"] = dict(min_silence_duration_ms=2000)
-
-    segments, _ = model.transcribe(file_path, **transcribe_opts)
+        segments, _ = detect_speech_segments(file_path)
+    else:
+        model = get_cached_model("tiny.en")
+        segments, _ = model.transcribe(file_path, vad_filter=False, beam_size=beam_size)
 
-    blocks, segment_count = cluster_segments(segments)
+    blocks, segment_count = cluster_segments(segments, max_blocks=max_blocks)
 
     for b in blocks:
         print(f"[BLOCK] {b['start']}|{b['end']}")
@@ -306,16 +972,20 @@ def run_batch_scanner(directory, use_vad=True, report_path=None, model=None, ski
     MODE 3: BATCH SCOUT
     Scans all media files in a directory for voice activity.
     Outputs a JSON report with detected speech blocks.
+    With VAD on, blocks come from Silero VAD alone (no Whisper decode);
+    the Tiny model is only used for VAD-off (outdoor/noisy) scans.
     """
-    media_files = find_media_files(directory)
+    media_files = find_media_files(directory, use_index=skip_existing)
     total = len(media_files)
     print(f"[BATCH] Found {total} media files in: {directory}")
     print(f"[BATCH] VAD: {'ON' if use_vad else 'OFF (outdoor/noisy mode)'}")
 
     model_was_provided = model is not None
-    if model is None:
+    if use_vad:
+        print(f"[BATCH] Using Silero VAD for speech detection (no Whisper decode)...")
+    elif model is None:
         print(f"[BATCH] Loading tiny.en model (one-time)...")
-        model = load_whisper_model("tiny.en")
+        model = get_cached_model("tiny.en")
     else:
         print(f"[BATCH] Using pre-loaded model...")
 
@@ -326,16 +996,29 @@ def run_batch_scanner(directory, use_vad=True, report_path=None, model=None, ski
     
     if skip_existing and os.path.exists(report_path):
         try:
-             with open(report_path, "r", encoding="utf-8") as f:
-                 data = json.load(f)
-                 if "results" in data:
-                     for r in data["results"]:
-                         if "file" in r:
-                             existing_results[r["file"]] = r
+             data = read_json_report(report_path)
+             if "results" in data:
+                 for r in data["results"]:
+                     if "file" in r:
+                         existing_results[r["file"]] = r
              print(f"[BATCH] Loaded {len(existing_results)} existing results for skipping.")
         except Exception as e:
             print(f"[BATCH] Failed to load existing report: {e}")
 
+    # Per-file progress log: survives a crash and is folded into the report at the end
+    progress_path = report_path + ".jsonl"
+    if skip_existing and os.path.exists(progress_path):
+        try:
+            recovered = [r for r in read_jsonl(progress_path) if "file" in r]
+            for r in recovered:
+                existing_results[r["file"]] = r
+            print(f"[BATCH] Recovered {len(recovered)} results from an interrupted scan.")
+        except OSError as e:
+            print(f"[BATCH] Failed to read progress log: {e}")
+
+    os.makedirs(os.path.dirname(os.path.abspath(report_path)), exist_ok=True)
+    progress = open_jsonl_append(progress_path) if skip_existing else open(progress_path, "wb")
+
     results = []
     files_with_voice = 0
 
@@ -353,20 +1036,17 @@ def run_batch_scanner(directory, use_vad=True, report_path=None, model=None, ski
         print(f"\n[{i}/{total}] Scanning: {file_path}")
 
         try:
-            transcribe_opts = dict(
-                vad_filter=use_vad,
-                beam_size=beam_size
-            )
             if use_vad:
-                transcribe_opts["vad_parameters"] = dict(min_silence_duration_ms=2000)
-
-            segments, info = model.transcribe(file_path, **transcribe_opts)
+                segments, file_duration = detect_speech_segments(file_path)
+            else:
+                segments, info = model.transcribe(file_path, vad_filter=False, beam_size=beam_size)
+                file_duration = info.duration  # TranscriptionInfo always carries duration
 
             blocks, segment_count = cluster_segments(segments)
 
             if blocks:
                 files_with_voice += 1
-                duration = info.duration if hasattr(info, 'duration') else 0
+                duration = file_duration
 
                 entry = {
                     "file": file_path,
@@ -398,10 +1078,12 @@ def run_batch_scanner(directory, use_vad=True, report_path=None, model=None, ski
                 "file": file_path,
                 "error": str(e)
             })
+        append_jsonl(progress, results[-1])
+
+    progress.close()
+    release_cuda_cache()
 
     # Write JSON report
-    # Ensure directory exists
-    os.makedirs(os.path.dirname(os.path.abspath(report_path)), exist_ok=True)
 
     report = {
         "date": datetime.now().isoformat(),
@@ -409,11 +1091,15 @@ def run_batch_scanner(directory, use_vad=True, report_path=None, model=None, ski
         "total_files": total,
         "files_with_voice": files_with_voice,
         "results": results,
-        "scan_model": "tiny.en" if not model_was_provided else "custom"
+        "scan_model": "silero-vad" if use_vad else ("tiny.en" if not model_was_provided else "custom")
     }
 
-    with open(report_path, "w", encoding="utf-8") as f:
-        json.dump(report, f, indent=2, ensure_ascii=False)
+    write_json_report(report_path, report)
+    # The full report now holds everything the progress log did
+    try:
+        os.remove(progress_path)
+    except OSError:
+        pass
 
     if results:
         print(f"\n--- Files with Detected Voice ---")
@@ -422,62 +1108,123 @@ def run_batch_scanner(directory, use_vad=True, report_path=None, model=None, ski
                 print(f"\n  {r['file']}")
                 for b in r["blocks"]:
                     print(f"    [{b['start']:.1f}s - {b['end']:.1f}s]")
-                for cmd in r["transcribe_cmds"]:
-                    print(f"    > {cmd}")
+        # One resident model for every block instead of one `transcribe` process per block
+        print("\n--- Transcribe daemon input (python fast_engine.py transcribe_daemon --model <name>) ---")
+        emit([f"{r['file']}\t{b['start']}\t{b['end']}\n"
+              for r in results if "error" not in r for b in r.get("blocks", [])])
+
+# Write buffer for transcript files (one flush per file rather than per block)
+TRANSCRIPT_WRITE_BUFFER = 64 * 1024
 
-def run_transcriber(file_path, start, end, model=None, model_name="large-v3", output_dir=None, skip_existing=False, beam_size=5):
+# Path separators in hub-style model names ("org/model") would otherwise become directories
+_MODEL_NAME_TABLE = str.maketrans({"/": "_", "\\": "_"})
+
+def transcript_path(file_path, model_name, output_dir=None):
+    """Transcript location for a media file: next to it, or in output_dir when given."""
+    model_tag = model_name.translate(_MODEL_NAME_TABLE)
+    if output_dir:
+        base_name = os.path.splitext(os.path.basename(file_path))[0]
+        return os.path.join(output_dir, f"{base_name}_transcript_{model_tag}.txt")
+    return f"{os.path.splitext(file_path)[0]}_transcript_{model_tag}.txt"
+
+def run_transcriber(file_path, start, end, model=None, model_name="large-v3", output_dir=None, skip_existing=False, beam_size=5, batch_size=None, out_fh=None, audio=None, keep_lines=False):
     """
     MODE 2: SNIPER (Accuracy)
     Extracts the specific meeting and applies Large-v3.
-    Saves transcription to a .txt file.
+    Streams the transcription into a .txt file, or into out_fh when the caller
+    already holds the transcript open (batch mode, one handle per file).
+    audio: the file's decoded 16 kHz waveform, if the caller already has it.
+    keep_lines: also return the transcript lines (otherwise returns None).
     """
-    # Check skip_existing BEFORE expensive model load
-    base_name = os.path.splitext(os.path.basename(file_path))[0]
-    if output_dir:
-        out_path = os.path.join(output_dir, f"{base_name}_transcript_{model_name}.txt")
-    else:
-        out_path = f"{os.path.splitext(file_path)[0]}_transcript_{model_name}.txt"
+    if out_fh is None:
+        # Check skip_existing BEFORE expensive model load
+        out_path = transcript_path(file_path, model_name, output_dir)
 
-    if skip_existing and os.path.exists(out_path):
-        print(f"[SKIPPING] Target exists: {out_path}")
-        return []
+        if skip_existing and os.path.exists(out_path):
+            print(f"[SKIPPING] Target exists: {out_path}")
+            return [] if keep_lines else None
 
     print(f"[STATUS] Transcribing: {file_path}")
     print(f"[STATUS] Range: {start:.1f}s - {end:.1f}s")
 
     if model is None:
-        model = load_whisper_model(model_name)
-
-    segments, _ = model.transcribe(
-        file_path,
-        clip_timestamps=f"{start},{end}",
-        beam_size=beam_size,
-        vad_filter=True
-    )
+        model = get_cached_model(model_name)
+    if batch_size is None:
+        batch_size = pick_batch_size(model, model_name)
+
+    if use_batching(model, batch_size):
+        # Batched pipeline has no seconds-based clip range: slice the waveform instead
+        if audio is None:
+            from faster_whisper.audio import decode_audio
+            audio = decode_audio(file_path, sampling_rate=16000)
+        audio = audio[int(start * 16000):int(end * 16000)]
+        segments, _ = transcribe_audio(model, audio, batch_size=batch_size, beam_size=beam_size)
+        offset = start
+    else:
+        segments, _ = model.transcribe(
+            file_path,
+            clip_timestamps=f"{start},{end}",
+            beam_size=beam_size,
+            vad_filter=True
+        )
+        offset = 0
 
-    # Build transcription output
-    lines = []
-    for s in segments:
-        line = f"[{s.start:.2f} - {s.end:.2f}] {s.text.strip()}"
-        lines.append(line)
-        print(f"[TEXT] {s.start:.2f}|{s.end:.2f}|{s.text.strip()}")
+    if out_fh is not None:
+        return _write_block(out_fh, file_path, start, end, segments, offset, keep_lines)
 
     # Append if file exists (multiple blocks for same file)
     if output_dir:
         os.makedirs(output_dir, exist_ok=True)
 
-    mode = "a" if os.path.exists(out_path) else "w"
-    with open(out_path, mode, encoding="utf-8") as f:
-        f.write(f"--- Transcription [{start:.1f}s - {end:.1f}s] ---\n")
-        f.write(f"Source: {os.path.abspath(file_path)}\n")
-        for line in lines:
-            f.write(line + "\n")
-        f.write("\n")
+    # The block is streamed into a .part copy (earlier blocks included) and only replaces
+    # the transcript once it is complete, so an interrupted run never leaves a truncated one
+    tmp_path = out_path + ".part"
+    if os.path.exists(out_path):
+        import shutil
+        shutil.copyfile(out_path, tmp_path)
+    ok = False
+    try:
+        with open(tmp_path, "a", encoding="utf-8", buffering=TRANSCRIPT_WRITE_BUFFER) as f:
+            lines = _write_block(f, file_path, start, end, segments, offset, keep_lines)
+        ok = True
+    finally:
+        finish_part_file(out_path, ok)
 
     print(f"[SAVED] {out_path}")
     return lines
 
-def run_batch_transcriber(report_path=None, output_dir=None, skip_existing=False, model_name="large-v1", beam_size=5):
+def finish_part_file(out_path, ok):
+    """Promote out_path's finished .part file into place, or discard it."""
+    tmp_path = out_path + ".part"
+    if ok:
+        os.replace(tmp_path, out_path)
+        return
+    try:
+        os.remove(tmp_path)
+    except OSError:
+        pass
+
+def _write_block(f, file_path, start, end, segments, offset=0.0, keep_lines=False):
+    """
+    Write one transcribed block (header, source, lines) to an open transcript
+    as it is decoded. Returns the lines if keep_lines, else None.
+    """
+    f.write(f"--- Transcription [{start:.1f}s - {end:.1f}s] ---\n")
+    f.write(f"Source: {os.path.abspath(file_path)}\n")
+    lines = [] if keep_lines else None
+    for s in segments:
+        text = s.text.strip()
+        seg_start, seg_end = s.start + offset, s.end + offset
+        line = f"[{seg_start:.2f} - {seg_end:.2f}] {text}"
+        f.write(line + "\n")
+        if not QUIET_SEGMENTS:
+            sys.stdout.write(f"[TEXT] {seg_start:.2f}|{seg_end:.2f}|{text}\n")
+        if keep_lines:
+            lines.append(line)
+    f.write("\n")
+    return lines
+
+def run_batch_transcriber(report_path=None, output_dir=None, skip_existing=False, model_name="large-v1", beam_size=5, batch_size=None, model=None):
     """
     MODE 4: BATCH SNIPER
     Reads the scan report and transcribes all detected voice segments
@@ -489,225 +1236,615 @@ def run_batch_transcriber(report_path=None, output_dir=None, skip_existing=False
     if not os.path.exists(report_path):
         print(f"[ERROR] Report not found: {report_path}")
         print("[ERROR] Run batch_scan first to generate the report.")
-        exit(1)
+        return
 
-    with open(report_path, "r", encoding="utf-8") as f:
-        report = json.load(f)
+    report = read_json_report(report_path)
 
     # Filter to files with voice blocks (no errors)
     voice_files = [r for r in report["results"] if "error" not in r and r.get("blocks")]
     total_blocks = sum(len(r["blocks"]) for r in voice_files)
 
     print(f"[BATCH] Found {len(voice_files)} files with voice ({total_blocks} blocks to transcribe)")
-    print(f"[BATCH] Loading {model_name} model (one-time)...")
+    # Loaded only once something is left to transcribe (a fully skipped re-run exits without it)
+    if any(not (skip_existing and os.path.exists(transcript_path(r["file"], model_name, output_dir)))
+           for r in voice_files):
+        if model is None:
+            print(f"[BATCH] Loading {model_name} model (one-time)...")
+            model = get_cached_model(model_name)
+        else:
+            print(f"[BATCH] Using pre-loaded {model_name} model...")
+        if batch_size is None:
+            batch_size = pick_batch_size(model, model_name)
 
-    model = load_whisper_model(model_name)
+    if output_dir:
+        os.makedirs(output_dir, exist_ok=True)
 
     block_num = 0
     for i, entry in enumerate(voice_files, 1):
         file_path = entry["file"]
         print(f"\n[{i}/{len(voice_files)}] {file_path}")
 
-        for b in entry["blocks"]:
-            block_num += 1
-            print(f"  Block {block_num}/{total_blocks}: {b['start']:.1f}s - {b['end']:.1f}s")
+        out_path = transcript_path(file_path, model_name, output_dir)
+
+        if skip_existing and os.path.exists(out_path):
+            print(f"[SKIPPING] Target exists: {out_path}")
+            block_num += len(entry["blocks"])
+            continue
+
+        # One handle per file: every block of this file is written through it, into a
+        # .part file that replaces the transcript once all blocks are done
+        try:
+            out_fh = open(out_path + ".part", "w", encoding="utf-8", buffering=TRANSCRIPT_WRITE_BUFFER)
+        except OSError as e:
+            print(f"  [ERROR] {e}")
+            block_num += len(entry["blocks"])
+            continue
+
+        # Batched blocks are cut from the waveform: decode the file once, not once per block
+        audio = None
+        if use_batching(model, batch_size) and len(entry["blocks"]) > 1:
+            from faster_whisper.audio import decode_audio
             try:
-                run_transcriber(file_path, b["start"], b["end"], model=model, model_name=model_name, output_dir=output_dir, skip_existing=skip_existing, beam_size=beam_size)
+                audio = decode_audio(file_path, sampling_rate=16000)
             except Exception as e:
                 print(f"  [ERROR] {e}")
 
+        written = 0
+        with out_fh:
+            for b in entry["blocks"]:
+                block_num += 1
+                print(f"  Block {block_num}/{total_blocks}: {b['start']:.1f}s - {b['end']:.1f}s")
+                try:
+                    run_transcriber(file_path, b["start"], b["end"], model=model, model_name=model_name, beam_size=beam_size, batch_size=batch_size, out_fh=out_fh, audio=audio)
+                    written += 1
+                except Exception as e:
+                    print(f"  [ERROR] {e}")
+        finish_part_file(out_path, written > 0)
+        if written:
+            print(f"[SAVED] {out_path}")
+        else:
+            print(f"[ERROR] No block of {file_path} could be transcribed, nothing saved")
+
+    release_cuda_cache()
+
     print(f"\n{'='*60}")
     print(f"BATCH TRANSCRIPTION COMPLETE")
     print(f"{'='*60}")
     print(f"Files processed: {len(voice_files)}")
     print(f"Blocks transcribed: {block_num}")
 
-def run_batch_transcribe_dir(directory, use_vad=True, output_dir=None, skip_existing=False, model_name="large-v1", beam_size=5):
+def run_scan_then_transcribe(directory, use_vad=True, output_dir=None, skip_existing=False, model_name="large-v1", beam_size=5, batch_size=None, scout_model=None, model=None):
     """
-    MODE 5: FULL BATCH TRANSCRIBE
-    Transcribes ALL media files in a directory using the specified model.
+    MODE 4b: SCAN + SNIPER IN ONE PROCESS
+    Scans each media file for voice blocks and transcribes them straight away.
+    Both models are loaded once and stay resident; blocks are handed over in
+    memory instead of through the JSON scan report.
     """
     media_files = find_media_files(directory)
     total = len(media_files)
     print(f"[BATCH] Found {total} media files in: {directory}")
     print(f"[BATCH] VAD: {'ON' if use_vad else 'OFF (outdoor/noisy mode)'}")
-    print(f"[BATCH] Loading {model_name} model (one-time)...")
-
-    model = load_whisper_model(model_name)
-
-    transcribed = 0
-    errors = 0
 
     if output_dir:
         os.makedirs(output_dir, exist_ok=True)
 
+    files_with_voice = 0
+    blocks_transcribed = 0
     for i, file_path in enumerate(media_files, 1):
-        # Check skip existing before loading model or processing? 
-        # Actually we need to calculate out_path to know if we skip.
-        # But out_path logic is duplicated inside loop.
-        
-        base_name = os.path.splitext(os.path.basename(file_path))[0]
-        if output_dir:
-            out_check = os.path.join(output_dir, f"{base_name}_transcript_{model_name}.txt")
-        else:
-            out_check = f"{os.path.splitext(file_path)[0]}_transcript_{model_name}.txt"
-            
-        if skip_existing and os.path.exists(out_check):
-             print(f"\n[{i}/{total}] [SKIPPING] {file_path}")
-             continue
+        out_path = transcript_path(file_path, model_name, output_dir)
 
-        print(f"\n[{i}/{total}] Transcribing: {file_path}")
+        if skip_existing and os.path.exists(out_path):
+            print(f"\n[{i}/{total}] [SKIPPING] {file_path}")
+            continue
+
+        print(f"\n[{i}/{total}] Scanning: {file_path}")
+        # Models load on first use, so an empty or fully skipped directory costs no load.
+        # The scout model is only needed when VAD is off; VAD scans need no Whisper decode
+        if not use_vad and scout_model is None:
+            print(f"[BATCH] Loading tiny.en model (one-time)...")
+            scout_model = get_cached_model("tiny.en")
         try:
-            transcribe_opts = dict(
-                beam_size=beam_size,
-                vad_filter=use_vad,
-            )
             if use_vad:
-                transcribe_opts["vad_parameters"] = dict(min_silence_duration_ms=2000)
+                segments, _ = detect_speech_segments(file_path)
+            else:
+                segments, _ = scout_model.transcribe(file_path, vad_filter=False, beam_size=1)
+            blocks, _ = cluster_segments(segments)
+        except Exception as e:
+            print(f"  [ERROR] {e}")
+            continue
 
-            segments, info = model.transcribe(file_path, **transcribe_opts)
+        if not blocks:
+            print(f"  [SILENT] No speech detected")
+            continue
 
-            lines = []
-            for s in segments:
-                line = f"[{s.start:.2f} - {s.end:.2f}] {s.text.strip()}"
-                lines.append(line)
-                print(f"[TEXT] {s.start:.2f}|{s.end:.2f}|{s.text.strip()}")
+        files_with_voice += 1
+        if model is None:
+            print(f"[BATCH] Loading {model_name} model (one-time)...")
+            model = get_cached_model(model_name)
+        if batch_size is None:
+            batch_size = pick_batch_size(model, model_name)
+        written = 0
+        with open(out_path + ".part", "w", encoding="utf-8", buffering=TRANSCRIPT_WRITE_BUFFER) as out_fh:
+            for b in blocks:
+                print(f"  [VOICE] {b['start']:.1f}s - {b['end']:.1f}s")
+                try:
+                    run_transcriber(file_path, b["start"], b["end"], model=model, model_name=model_name, beam_size=beam_size, batch_size=batch_size, out_fh=out_fh)
+                    written += 1
+                except Exception as e:
+                    print(f"  [ERROR] {e}")
+        blocks_transcribed += written
+        finish_part_file(out_path, written > 0)
+        if written:
+            print(f"[SAVED] {out_path}")
+        else:
+            print(f"[ERROR] No block of {file_path} could be transcribed, nothing saved")
 
-            if lines:
-                base_name = os.path.splitext(os.path.basename(file_path))[0]
-                if output_dir:
-                    out_path = os.path.join(output_dir, f"{base_name}_transcript_{model_name}.txt")
-                else:
-                    out_path = f"{os.path.splitext(file_path)[0]}_transcript_{model_name}.txt"
-                
-                with open(out_path, "w", encoding="utf-8") as f:
-                    f.write(f"--- Full Transcription ({info.duration:.1f}s) ---\n")
-                    f.write(f"Source: {os.path.abspath(file_path)}\n")
-                    for line in lines:
-                        f.write(line + "\n")
-                print(f"[SAVED] {out_path}")
-                transcribed += 1
-            else:
-                print(f"[SILENT] {file_path}")
-        except Exception as e:
-            print(f"[ERROR] {e}")
-            errors += 1
+    release_cuda_cache()
 
     print(f"\n{'='*60}")
-    print(f"BATCH TRANSCRIPTION COMPLETE")
+    print(f"SCAN + TRANSCRIPTION COMPLETE")
     print(f"{'='*60}")
     print(f"Total files: {total}")
-    print(f"Transcribed: {transcribed}")
-    print(f"Errors:      {errors}")
+    print(f"Files with voice: {files_with_voice}")
+    print(f"Blocks transcribed: {blocks_transcribed}")
 
-def run_transcribe_file(file_path, model_name="large-v3", use_vad=True, output_dir=None, skip_existing=False, beam_size=5):
+def run_batch_transcribe_dir(directory, use_vad=True, output_dir=None, skip_existing=False, model_name="large-v1", beam_size=5, batch_size=None, model=None):
     """
-    MODE 6: FULL FILE TRANSCRIBE
-    Transcribes a single media file with the specified model.
+    MODE 5: FULL BATCH TRANSCRIBE
+    Transcribes ALL media files in a directory using the specified model.
+    Files are processed shortest first so short clips batch together
+    (<10s and 10-30s clips in separate batches).
     """
-    print(f"[STATUS] Transcribing full file: {file_path}")
-    print(f"[STATUS] Model: {model_name}")
+    media_files = find_media_files(directory)
+    total = len(media_files)
+    durations = {p: probe_duration(p) for p in media_files}
+    media_files.sort(key=durations.__getitem__)
+    print(f"[BATCH] Found {total} media files in: {directory}")
+    print(f"[BATCH] VAD: {'ON' if use_vad else 'OFF (outdoor/noisy mode)'}")
+    from faster_whisper.vad import get_speech_timestamps
+
+    transcribed = 0
+    errors = 0
 
-    base_name = os.path.splitext(os.path.basename(file_path))[0]
     if output_dir:
-        out_check = os.path.join(output_dir, f"{base_name}_transcript_{model_name}.txt")
-    else:
-        out_check = f"{os.path.splitext(file_path)[0]}_transcript_{model_name}.txt"
+        os.makedirs(output_dir, exist_ok=True)
+
+    # Short clips are held back and decoded K at a time in one generate() call
+    short_clips = []  # (file_path, out_path, audio)
+
+    def flush_short_clips():
+        nonlocal transcribed, errors
+        if not short_clips:
+            return
+        print(f"\n[BATCH] Decoding {len(short_clips)} short clips in one batch...")
+        try:
+            texts = transcribe_clip_batch(model, [c[2] for c in short_clips], beam_size=beam_size)
+        except Exception as e:
+            print(f"[ERROR] {e}")
+            errors += len(short_clips)
+            short_clips.clear()
+            return
+
+        # Status lines for the whole batch go out in one write
+        out = []
+        for (file_path, out_path, audio), text in zip(short_clips, texts):
+            if not text:
+                out.append(f"[SILENT] {file_path}\n")
+                continue
+            duration = len(audio) / 16000.0
+            if not QUIET_SEGMENTS:
+                out.append(f"[TEXT] 0.00|{duration:.2f}|{text}\n")
+            with open(out_path, "w", encoding="utf-8") as f:
+                f.write(f"--- Full Transcription ({duration:.1f}s) ---\n")
+                f.write(f"Source: {os.path.abspath(file_path)}\n")
+                f.write(f"[0.00 - {duration:.2f}] {text}\n")
+            out.append(f"[SAVED] {out_path}\n")
+            transcribed += 1
+        emit(out)
+        short_clips.clear()
+
+    # Resolve skips up front so only files that will be transcribed get prefetched
+    jobs = []  # (index, file_path, out_path)
+    for i, file_path in enumerate(media_files, 1):
+        out_check = transcript_path(file_path, model_name, output_dir)
+            
+        if skip_existing and os.path.exists(out_check):
+             print(f"\n[{i}/{total}] [SKIPPING] {file_path}")
+             continue
+        jobs.append((i, file_path, out_check))
+
+    # Loaded only once something is left to transcribe (a fully skipped re-run exits without it)
+    if jobs:
+        if model is None:
+            print(f"[BATCH] Loading {model_name} model (one-time)...")
+            model = get_cached_model(model_name)
+        else:
+            print(f"[BATCH] Using pre-loaded {model_name} model...")
+        if batch_size is None:
+            batch_size = pick_batch_size(model, model_name)
+
+    # Next files decode on a background thread while the current one is on the GPU
+    decoded = prefetch_audio([job[1] for job in jobs])
+    for (i, file_path, out_check), (_, audio_future) in zip(jobs, decoded):
+        print(f"\n[{i}/{total}] Transcribing: {file_path}")
+        try:
+            audio = audio_future.result()
+
+            if use_batching(model, batch_size) and len(audio) <= SHORT_CLIP_SAMPLES:
+                if use_vad and not get_speech_timestamps(audio, get_vad_options()):
+                    print(f"[SILENT] {file_path}")
+                    continue
+                if short_clips and (len(short_clips[-1][2]) <= SHORT_CLIP_BUCKET_SAMPLES) != (len(audio) <= SHORT_CLIP_BUCKET_SAMPLES):
+                    flush_short_clips()
+                short_clips.append((file_path, out_check, audio))
+                if len(short_clips) >= batch_size:
+                    flush_short_clips()
+                continue
+
+            segments, info = transcribe_audio(model, audio, use_vad=use_vad, batch_size=batch_size, beam_size=beam_size)
+
+            header = (f"--- Full Transcription ({info.duration:.1f}s) ---\n"
+                      f"Source: {os.path.abspath(file_path)}\n")
+            if write_transcript_stream(out_check, header, segments):
+                print(f"[SAVED] {out_check}")
+                transcribed += 1
+            else:
+                print(f"[SILENT] {file_path}")
+        except Exception as e:
+            print(f"[ERROR] {e}")
+            errors += 1
+
+    flush_short_clips()
+    release_cuda_cache()
+
+    print(f"\n{'='*60}")
+    print(f"BATCH TRANSCRIPTION COMPLETE")
+    print(f"{'='*60}")
+    print(f"Total files: {total}")
+    print(f"Transcribed: {transcribed}")
+    print(f"Errors:      {errors}")
+
+def run_transcribe_file(file_path, model_name="large-v3", use_vad=True, output_dir=None, skip_existing=False, beam_size=5, batch_size=None, model=None):
+    """
+    MODE 6: FULL FILE TRANSCRIBE
+    Transcribes a single media file with the specified model.
+    """
+    print(f"[STATUS] Transcribing full file: {file_path}")
+    print(f"[STATUS] Model: {model_name}")
+
+    out_check = transcript_path(file_path, model_name, output_dir)
 
     if skip_existing and os.path.exists(out_check):
         print(f"[SKIPPING] Target exists: {out_check}")
         return
 
     print(f"[STATUS] VAD: {'ON' if use_vad else 'OFF'}")
-    print(f"[BATCH] Loading {model_name} model...")
+    if model is None:
+        print(f"[BATCH] Loading {model_name} model...")
+        model = get_cached_model(model_name)
+    if batch_size is None:
+        batch_size = pick_batch_size(model, model_name)
 
-    model = load_whisper_model(model_name)
+    segments, info = transcribe_audio(model, file_path, use_vad=use_vad, batch_size=batch_size, beam_size=beam_size)
 
-    transcribe_opts = dict(
-        beam_size=beam_size,
-        vad_filter=use_vad,
-    )
-    if use_vad:
-        transcribe_opts["vad_parameters"] = dict(min_silence_duration_ms=2000)
+    if output_dir:
+        os.makedirs(output_dir, exist_ok=True)
+    header = (f"--- Transcription ({model_name}, {info.duration:.1f}s) ---\n"
+              f"Source: {os.path.abspath(file_path)}\n")
+    if write_transcript_stream(out_check, header, segments):
+        print(f"[SAVED] {out_check}")
+    else:
+        print(f"[SILENT] {file_path}")
 
-    segments, info = model.transcribe(file_path, **transcribe_opts)
+    print(f"\n[1/1] Transcribing: {file_path}")
+    print("TRANSCRIPTION COMPLETE")
 
+def run_transcribe_daemon(model_name="large-v3", beam_size=5, batch_size=None, model=None):
+    """
+    MODE 6b: TRANSCRIBE DAEMON
+    Loads the model once, then transcribes one block per stdin line:
+        path<TAB>start<TAB>end[<TAB>output_dir]
+    and answers each with one JSON line, like the server: {"status": "complete"|"error", ...}.
+    Log lines all carry a [TAG] prefix, so replies can't be mistaken for them.
+    Replaces spawning `fast_engine.py transcribe` (and a model load) per block.
+    """
+    if model is None:
+        print(f"[BATCH] Loading {model_name} model (one-time)...")
+        model = get_cached_model(model_name)
+    if batch_size is None:
+        batch_size = pick_batch_size(model, model_name)
+    print("[DAEMON] Ready", flush=True)
+
+    for line in sys.stdin:
+        line = line.rstrip("\r\n")
+        if not line:
+            continue
+        fields = line.split("\t")
+        file_path = fields[0]
+        try:
+            start, end = float(fields[1]), float(fields[2])
+            output_dir = fields[3] if len(fields) > 3 and fields[3] else None
+            run_transcriber(file_path, start, end, model=model, model_name=model_name, output_dir=output_dir,
+                            beam_size=beam_size, batch_size=batch_size)
+            print(json.dumps({"status": "complete", "action": "transcribe", "file": file_path}), flush=True)
+        except Exception as e:
+            print(json.dumps({"status": "error", "action": "transcribe", "file": file_path, "message": str(e)}), flush=True)
+
+    release_cuda_cache()
+
+def _build_query_regex(query_words):
+    """
+    Fallback matcher without pyahocorasick: one precompiled alternation, scanned in a single pass.
+    Returns (pattern, expansions, bytes_pattern). The pattern tries the longest word first at each
+    position; expansions[w] lists (end offset within w, word) for every query word contained in w,
+    so words hidden inside a longer match are still reported. bytes_pattern (ASCII queries only)
+    scans raw bytes directly.
+    """
+    import re
+    words = sorted(set(query_words), key=len, reverse=True)
+    alternation = "(?=(" + "|".join(re.escape(w) for w in words) + "))"
+    pattern = re.compile(alternation)
+    bytes_pattern = re.compile(alternation.encode("ascii")) if alternation.isascii() else None
+    expansions = {}
+    for w in words:
+        hits = []
+        for u in words:
+            pos = w.find(u)
+            while pos != -1:
+                hits.append((pos + len(u) - 1, u))
+                pos = w.find(u, pos + 1)
+        expansions[w] = sorted(hits)
+    return pattern, expansions, bytes_pattern
+
+def _build_query_automaton(query_words):
+    """Aho-Corasick automaton over the query words (precompiled regex if pyahocorasick is not installed)."""
+    if not query_words:
+        return None
+    try:
+        import ahocorasick
+    except ImportError:
+        return _build_query_regex(query_words)
+    automaton = ahocorasick.Automaton()
+    for w in set(query_words):
+        automaton.add_word(w, w)
+    automaton.make_automaton()
+    return automaton
+
+def _iter_query_matches(content_lower, query_words, automaton=None):
+    """Yield (end_offset, word) for every query word occurrence, ordered by line."""
+    if automaton is None:
+        automaton = _build_query_automaton(query_words)
+        if automaton is None:
+            return
+    if not isinstance(automaton, tuple):
+        yield from automaton.iter(content_lower)
+        return
+
+    pattern, expansions, bytes_pattern = automaton
+    if isinstance(content_lower, bytes):
+        for m in bytes_pattern.finditer(content_lower):
+            start = m.start()
+            for offset, word in expansions[m.group(1).decode("ascii")]:
+                yield start + offset, word
+        return
+    for m in pattern.finditer(content_lower):
+        start = m.start()
+        for offset, word in expansions[m.group(1)]:
+            yield start + offset, word
+
+# Cache entry holding a transcript's lowercased bytes, reused while it is newer than the transcript
+LOWERCASE_CACHE_SUFFIX = ".lc"
+
+def _advise_sequential(fd):
+    """Ask the kernel for aggressive read-ahead on a file read front to back (no-op off POSIX)."""
+    if hasattr(os, "posix_fadvise"):
+        try:
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_SEQUENTIAL)
+        except OSError:
+            pass
+
+def _read_bytes(path):
+    """Read a whole file in one sized read (empty files return b"")."""
+    with open(path, "rb") as f:
+        _advise_sequential(f.fileno())
+        return f.read()
+
+def _read_lowercased(fpath):
+    """
+    Lowercased bytes of a transcript, cached as a ".lc" entry in CACHE_DIR.
+    Returns (lowered, raw); raw is None on a cache hit so the transcript
+    itself is only read when it actually matches.
+    """
+    lc_path = cache_path(fpath, LOWERCASE_CACHE_SUFFIX)
+    try:
+        src, cached = os.stat(fpath), os.stat(lc_path)
+        # bytes.lower() keeps the length, so a size mismatch means a stale entry
+        if cached.st_mtime >= src.st_mtime and cached.st_size == src.st_size:
+            return _read_bytes(lc_path), None
+    except OSError:
+        pass
+
+    raw = _read_bytes(fpath)
+    lowered = raw.lower()
+    try:
+        with open(lc_path, "wb") as f:
+            f.write(lowered)
+    except OSError:
+        pass  # Unwritable cache: search still works, just uncached
+    return lowered, raw
+
+# Transcripts larger than this are streamed line by line instead of loaded whole
+SEARCH_STREAM_MIN_BYTES = 64 * 1024 * 1024
+
+def _search_transcript_streaming(fpath, query_words, automaton=None, max_lines=10):
+    """Line-by-line variant of _search_transcript: memory stays at one line regardless of file size."""
+    found_words = set()
     lines = []
-    for s in segments:
-        line = f"[{s.start:.2f} - {s.end:.2f}] {s.text.strip()}"
-        lines.append(line)
-        print(f"[TEXT] {s.start:.2f}|{s.end:.2f}|{s.text.strip()}")
+    matches = 0
+    with open(fpath, "r", encoding="utf-8", errors="replace") as f:
+        _advise_sequential(f.fileno())
+        for line_num, line in enumerate(f, 1):
+            hit = False
+            for _, word in _iter_query_matches(line.lower(), query_words, automaton):
+                found_words.add(word)
+                hit = True
+            if hit:
+                matches += 1
+                if len(lines) < max_lines:
+                    lines.append((line_num, line.strip()))
+
+    score = sum(1 for w in query_words if w in found_words)
+    if score == 0:
+        return None
+    return {
+        "file": fpath,
+        "score": score,
+        "total_words": len(query_words),
+        "matches": matches,
+        "lines": lines
+    }
 
-    if lines:
-        base_name = os.path.splitext(os.path.basename(file_path))[0]
-        # Use model name in filename for versioning
-        # Use model name directly in filename (dots/hyphens are valid in filenames)
-        
-        if output_dir:
-            os.makedirs(output_dir, exist_ok=True)
-            out_path = os.path.join(output_dir, f"{base_name}_transcript_{model_name}.txt")
-        else:
-            out_path = f"{os.path.splitext(file_path)[0]}_transcript_{model_name}.txt"
-            
-        with open(out_path, "w", encoding="utf-8") as f:
-            f.write(f"--- Transcription ({model_name}, {info.duration:.1f}s) ---\n")
-            f.write(f"Source: {os.path.abspath(file_path)}\n")
-            for line in lines:
-                f.write(line + "\n")
-        print(f"[SAVED] {out_path}")
+def _search_transcript(fpath, query_words, automaton=None, max_lines=10):
+    """Search one transcript in a single pass. Returns a result dict, or None if nothing matched."""
+    if os.path.getsize(fpath) >= SEARCH_STREAM_MIN_BYTES:
+        return _search_transcript_streaming(fpath, query_words, automaton, max_lines)
+    if all(w.isascii() for w in query_words):
+        # ASCII query: search the lowercased bytes and skip the UTF-8 decode of the whole file.
+        # bytes.lower() keeps offsets, latin-1 maps each byte to one char for the matcher,
+        # and an ASCII word can never match inside a multi-byte UTF-8 sequence.
+        lowered, content = _read_lowercased(fpath)
+        if not lowered:
+            return None
+        if automaton is None:
+            automaton = _build_query_automaton(query_words)
+        # The regex fallback scans the bytes as they are; pyahocorasick needs a str copy
+        content_lower = lowered if isinstance(automaton, tuple) else lowered.decode("latin-1")
+        newline = b"\n"
     else:
-        print(f"[SILENT] {file_path}")
+        with open(fpath, "r", encoding="utf-8") as f:
+            _advise_sequential(f.fileno())
+            content = f.read()
+        content_lower = content.lower()
+        newline = "\n"
+
+    newline_lower = b"\n" if isinstance(content_lower, bytes) else "\n"
+    found_words = set()
+    matched_lines = []  # (line_num, offset of a match on that line)
+    line_num = 1
+    last_offset = 0
+    for end, word in _iter_query_matches(content_lower, query_words, automaton):
+        found_words.add(word)
+        if end > last_offset:
+            line_num += content_lower.count(newline_lower, last_offset, end)
+            last_offset = end
+        if not matched_lines or matched_lines[-1][0] != line_num:
+            matched_lines.append((line_num, end))
+
+    # Score: count how many query words appear
+    score = sum(1 for w in query_words if w in found_words)
+    if score == 0:
+        return None
 
-    print(f"\n[1/1] Transcribing: {file_path}")
-    print("TRANSCRIPTION COMPLETE")
+    # Recover the original-case text of the first few matching lines (decoding only those)
+    if content is None:
+        content = _read_bytes(fpath)
+    lines = []
+    if len(content_lower) == len(content):
+        for num, offset in matched_lines[:max_lines]:
+            start = content.rfind(newline, 0, offset) + 1
+            stop = content.find(newline, offset)
+            line = content[start:stop if stop != -1 else len(content)]
+            if isinstance(line, bytes):
+                line = line.decode("utf-8", errors="replace")
+            lines.append((num, line.strip()))
+    else:
+        # str.lower() changed the length (rare non-ASCII case): offsets don't line up, split instead
+        all_lines = content.split("\n")
+        lines = [(num, all_lines[num - 1].strip()) for num, _ in matched_lines[:max_lines]]
+
+    return {
+        "file": fpath,
+        "score": score,
+        "total_words": len(query_words),
+        "matches": len(matched_lines),
+        "lines": lines  # Capped at max_lines matches per file
+    }
+
+def find_transcript_files(directory):
+    """
+    All *_transcript*.txt files under directory (absolute paths, os.walk order).
+    os.scandir directly: d_type answers is_dir() without a stat per entry, and only matches get a joined path.
+    """
+    found = []
+    stack = [os.path.abspath(directory)]
+    while stack:
+        subdirs = []
+        try:
+            with os.scandir(stack.pop()) as it:
+                for entry in it:
+                    name = entry.name
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            subdirs.append(entry.path)
+                            continue
+                    except OSError:
+                        continue
+                    if name.endswith(".txt") and "_transcript" in name:
+                        found.append(entry.path)
+        except OSError:
+            continue
+        stack.extend(reversed(subdirs))
+    return found
+
+# Below this many files, Pool start-up (a fresh interpreter per worker on Windows) outweighs the gain
+SEARCH_POOL_MIN_FILES = 64
+
+_worker_automaton = None  # (query_words, automaton) cached per search process
+
+def _scan_one(args):
+    """Search one transcript (Pool worker). Errors are returned, not printed, so output stays ordered."""
+    global _worker_automaton
+    fpath, query_words = args
+    if _worker_automaton is None or _worker_automaton[0] != query_words:
+        _worker_automaton = (query_words, _build_query_automaton(query_words))
+    try:
+        return _search_transcript(fpath, query_words, _worker_automaton[1])
+    except Exception as e:
+        return {"file": fpath, "error": str(e)}
 
 def run_search_transcripts(directory, query):
     """
     MODE 7: SEARCH TRANSCRIPTS
     Searches all _transcript.txt files for matching text.
     """
-    import re
     directory = os.path.abspath(directory)
     query_lower = query.lower()
-    query_words = query_lower.split()
+    query_words = tuple(query_lower.split())
 
     results = []
-    transcript_files = []
-
-    for root, dirs, files in os.walk(directory):
-        for f in files:
-            if "_transcript" in f and f.endswith(".txt"):
-                transcript_files.append(os.path.join(root, f))
+    transcript_files = find_transcript_files(directory)
 
     print(f"[SEARCH] Searching {len(transcript_files)} transcript files for: {query}")
 
-    for fpath in transcript_files:
-        try:
-            with open(fpath, "r", encoding="utf-8") as f:
-                content = f.read()
-
-            content_lower = content.lower()
-
-            # Score: count how many query words appear
-            score = sum(1 for w in query_words if w in content_lower)
-            if score == 0:
-                continue
-
-            # Find matching lines
-            matching_lines = []
-            for line_num, line in enumerate(content.split("\n"), 1):
-                if any(w in line.lower() for w in query_words):
-                    matching_lines.append((line_num, line.strip()))
+    jobs = [(fpath, query_words) for fpath in transcript_files]
+    if len(jobs) >= SEARCH_POOL_MIN_FILES:
+        with multiprocessing.Pool() as pool:
+            outcomes = list(pool.imap(_scan_one, jobs, chunksize=32))
+    elif len(jobs) > 1:
+        # Small sets: threads overlap the file reads without paying for worker processes
+        from concurrent.futures import ThreadPoolExecutor
+        with ThreadPoolExecutor(max_workers=min(32, (os.cpu_count() or 1) * 4)) as ex:
+            outcomes = list(ex.map(_scan_one, jobs))
+    else:
+        outcomes = [_scan_one(job) for job in jobs]
 
-            results.append({
-                "file": fpath,
-                "score": score,
-                "total_words": len(query_words),
-                "matches": len(matching_lines),
-                "lines": matching_lines[:10]  # Cap at 10 matches per file
-            })
-        except Exception as e:
-            print(f"[ERROR] {fpath}: {e}")
+    for result in outcomes:
+        if result is None:
+            continue
+        if "error" in result:
+            print(f"[ERROR] {result['file']}: {result['error']}")
+            continue
+        results.append(result)
 
     # Sort by score descending
     results.sort(key=lambda r: r["score"], reverse=True)
@@ -721,7 +1858,7 @@ def run_search_transcripts(directory, query):
         print()
 
     # Output JSON for the app to parse
-    print(f"[SEARCH_JSON] {json.dumps(results)}")
+    print(f"[SEARCH_JSON] {dumps_json(results)}")
 
 
 # =============================================================================
@@ -729,6 +1866,62 @@ def run_search_transcripts(directory, query):
 #   Uses sentence-transformers to search transcripts by meaning.
 # =============================================================================
 
+def embedding_cache_path(fpath, model_name):
+    """Cache entry (in CACHE_DIR) holding a transcript's line embeddings for one embedding model."""
+    return cache_path(fpath, f".{model_name.translate(_MODEL_NAME_TABLE)}.emb.npy")
+
+def _load_embedding_cache(cache_path, fpath, expected_rows):
+    """Cached embeddings (memory-mapped) if newer than the transcript and the right shape, else None."""
+    import numpy as np
+    try:
+        if os.path.getmtime(cache_path) < os.path.getmtime(fpath):
+            return None
+        emb = np.load(cache_path, mmap_mode="r")
+    except (OSError, ValueError):
+        return None
+    return emb if emb.ndim == 2 and emb.shape[0] == expected_rows else None
+
+# Corpora at least this large use a FAISS HNSW index (when faiss is installed) instead of exact scoring
+FAISS_MIN_CHUNKS = 100_000
+
+def _load_or_build_faiss_index(search_dirs, model_name, chunks, chunk_embeddings):
+    """
+    HNSW inner-product index over all chunk embeddings, persisted in CACHE_DIR (keyed by the set of
+    search_dirs, so searches over different folder sets keep separate indexes) and reused
+    while the set of transcripts (paths, mtimes, line counts) is unchanged.
+    Returns None if faiss is not installed.
+    """
+    try:
+        import faiss
+    except ImportError:
+        return None
+    import hashlib
+    from collections import Counter
+
+    rows = Counter(fpath for fpath, _ in chunks)
+    signature = hashlib.sha1("\n".join(
+        f"{fpath}|{os.stat(fpath).st_mtime_ns}|{rows[fpath]}" for fpath in rows
+    ).encode("utf-8")).hexdigest()
+    index_path = cache_path(search_dirs, f".{model_name.translate(_MODEL_NAME_TABLE)}.faiss")
+    try:
+        with open(index_path + ".sig", "r", encoding="utf-8") as f:
+            if f.read().strip() == signature:
+                print("[SEMANTIC] Using cached FAISS index")
+                return faiss.read_index(index_path)
+    except (OSError, RuntimeError):
+        pass
+
+    print(f"[SEMANTIC] Building FAISS index over {len(chunks)} chunks...")
+    index = faiss.IndexHNSWFlat(chunk_embeddings.shape[1], 32, faiss.METRIC_INNER_PRODUCT)
+    index.add(chunk_embeddings)
+    try:
+        faiss.write_index(index, index_path)
+        with open(index_path + ".sig", "w", encoding="utf-8") as f:
+            f.write(signature)
+    except (OSError, RuntimeError):
+        pass  # Unwritable cache: index is rebuilt next time
+    return index
+
 def run_semantic_search(directories, query, model_name="all-MiniLM-L6-v2", transcript_dir=None):
     """
     MODE 8: SEMANTIC SEARCH
@@ -736,7 +1929,7 @@ def run_semantic_search(directories, query, model_name="all-MiniLM-L6-v2", trans
     Falls back to exact search if sentence-transformers is not installed.
     """
     try:
-        from sentence_transformers import SentenceTransformer, util
+        from sentence_transformers import SentenceTransformer
     except ImportError:
         print("[ERROR] sentence-transformers not installed. Run 'Install Libraries' in Settings.")
         print(json.dumps({"status": "error", "message": "sentence-transformers not installed"}))
@@ -748,6 +1941,11 @@ def run_semantic_search(directories, query, model_name="all-MiniLM-L6-v2", trans
     except Exception as e:
         print(f"[ERROR] Failed to load model {model_name}: {e}")
         return
+    # FP16 encoder on the GPU; larger batches keep it busy
+    embed_batch_size = 256
+    if embed_model.device.type == "cuda":
+        embed_model.half()
+        embed_batch_size = 512
 
     # Collect all transcript files
     transcript_files = []
@@ -757,13 +1955,10 @@ def run_semantic_search(directories, query, model_name="all-MiniLM-L6-v2", trans
 
     seen = set()
     for d in search_dirs:
-        for root, _, files in os.walk(d):
-            for f in files:
-                if "_transcript" in f and f.endswith(".txt"):
-                    fpath = os.path.abspath(os.path.join(root, f))
-                    if fpath not in seen:
-                        seen.add(fpath)
-                        transcript_files.append(fpath)
+        for fpath in find_transcript_files(d):
+            if fpath not in seen:
+                seen.add(fpath)
+                transcript_files.append(fpath)
 
     print(f"[SEMANTIC] Found {len(transcript_files)} transcript files")
     if not transcript_files:
@@ -771,36 +1966,71 @@ def run_semantic_search(directories, query, model_name="all-MiniLM-L6-v2", trans
         return
 
     # Build chunks: each line with a timestamp is a chunk
+    import numpy as np
     chunks = []  # (file_path, line_text)
+    file_embeddings = []  # Per file: cached matrix, or None if it still has to be encoded
+    to_encode = []  # (index into file_embeddings, cache_path, line_texts)
     for fpath in transcript_files:
         try:
             with open(fpath, "r", encoding="utf-8") as f:
-                for line in f:
-                    line = line.strip()
-                    if line and not line.startswith("---") and not line.startswith("Source:"):
-                        chunks.append((fpath, line))
+                lines = [line for line in (l.strip() for l in f)
+                         if line and not line.startswith("---") and not line.startswith("Source:")]
         except Exception:
             continue
+        if not lines:
+            continue
+        chunks.extend((fpath, line) for line in lines)
+        emb_path = embedding_cache_path(fpath, model_name)
+        cached = _load_embedding_cache(emb_path, fpath, len(lines))
+        if cached is None:
+            to_encode.append((len(file_embeddings), emb_path, lines))
+        file_embeddings.append(cached)
 
     if not chunks:
         print("[SEMANTIC] No content found in transcripts")
         print(json.dumps({"status": "complete", "action": "semantic_search", "results": []}))
         return
 
-    print(f"[SEMANTIC] Encoding {len(chunks)} chunks...")
-    chunk_texts = [c[1] for c in chunks]
-
-    # Encode in batches to avoid OOM
-    query_embedding = embed_model.encode(query, convert_to_tensor=True)
-    chunk_embeddings = embed_model.encode(chunk_texts, convert_to_tensor=True, batch_size=256, show_progress_bar=False)
-
-    # Compute cosine similarities
-    scores = util.cos_sim(query_embedding, chunk_embeddings)[0]
+    # Only transcripts without an up-to-date cache are encoded; all of them in one batched call
+    if to_encode:
+        texts = [line for _, _, lines in to_encode for line in lines]
+        print(f"[SEMANTIC] Encoding {len(texts)} new chunks ({len(chunks) - len(texts)} cached)...")
+        encoded = embed_model.encode(texts, batch_size=embed_batch_size, show_progress_bar=False,
+                                     convert_to_numpy=True, normalize_embeddings=True)
+        offset = 0
+        for index, emb_path, lines in to_encode:
+            emb = encoded[offset:offset + len(lines)].astype(np.float16)
+            offset += len(lines)
+            file_embeddings[index] = emb
+            try:
+                np.save(emb_path, emb)
+            except OSError:
+                pass  # Unwritable cache: search still works, just uncached
+    else:
+        print(f"[SEMANTIC] Using cached embeddings for {len(chunks)} chunks")
+
+    # Embeddings are unit-length, so cosine similarity is a plain dot product
+    query_embedding = embed_model.encode(query, convert_to_numpy=True, normalize_embeddings=True).astype(np.float32)
+    chunk_embeddings = np.concatenate(file_embeddings).astype(np.float32)
+
+    index = None
+    if len(chunks) >= FAISS_MIN_CHUNKS:
+        index = _load_or_build_faiss_index(search_dirs, model_name, chunks, chunk_embeddings)
+    if index is not None:
+        # Approximate nearest neighbours: graph search instead of scoring every chunk
+        top_scores, top_ids = index.search(query_embedding.reshape(1, -1), 100)
+        hits = [(i, float(sc)) for i, sc in zip(top_ids[0].tolist(), top_scores[0].tolist()) if i >= 0]
+    else:
+        scores = chunk_embeddings @ query_embedding
+        # O(N) top-k selection, then sort only those k (no negated copy of the full score vector)
+        k = min(100, len(scores))
+        top = np.argpartition(scores, len(scores) - k)[-k:]
+        top = top[np.argsort(scores[top])[::-1]]
+        hits = [(i, float(scores[i])) for i in top.tolist()]
 
     # Get top results (threshold > 0.3)
     results = []
-    for idx in scores.argsort(descending=True)[:100]:
-        score = scores[idx].item()
+    for idx, score in hits:
         if score < 0.3:
             break
         fpath, line = chunks[idx]
@@ -823,8 +2053,57 @@ def run_semantic_search(directories, query, model_name="all-MiniLM-L6-v2", trans
 #   Uses local LLM via llama-cpp-python or cloud APIs.
 # =============================================================================
 
+def _read_transcript_lines(path, max_chars=None):
+    """
+    Transcript lines without block headers ("---", "Source:") or blank lines, read in
+    one buffered pass instead of holding the whole file and a split copy of it.
+    max_chars: stop reading once this many characters have been read.
+    """
+    with open(path, "r", encoding="utf-8", buffering=1 << 20) as f:
+        if max_chars is None:
+            return [line.rstrip("\n") for line in f
+                    if line.strip() and not line.startswith(("---", "Source:"))]
+        lines = []
+        read = 0
+        for line in f:
+            read += len(line)
+            if read > max_chars:
+                break
+            if line.strip() and not line.startswith(("---", "Source:")):
+                lines.append(line.rstrip("\n"))
+        return lines
+
+# Meeting-detection instructions. They always open the prompt: llama-cpp-python keeps the KV entries
+# of the longest prefix shared with the previous prompt, so per file only the transcript is prefilled
+DETECT_PROMPT_PREFIX = """Analyze this transcript and determine if it contains a real conversation or meeting, or if it is hallucinated/repetitive nonsense from a speech recognition model.
+
+Signs of HALLUCINATION: identical repeated phrases, single-word loops (e.g. "I" repeated many times), no conversational flow, no topic progression, very short repeated segments.
+Signs of REAL MEETING: varied sentences, questions and answers, topic changes, multiple speakers, natural conversation flow, specific details like names/places/plans.
+
+Respond with ONLY this JSON (no other text):
+{"has_meeting": true, "confidence": 85, "reason": "one sentence explanation"}
+
+The confidence field is an integer from 0 to 100 where 100 means absolute certainty.
+
+Transcript:
+"""
+DETECT_PROMPT_SUFFIX = """
+
+JSON:"""
+
+# Tokens kept free for a prompt's fixed instructions around the transcript
+PROMPT_SCAFFOLD_TOKENS = 256
+
+def _truncate_to_tokens(llm, text, max_tokens):
+    """text cut to at most max_tokens tokens of llm's own tokenizer (marked like the character cut)."""
+    # A token never spans more than a few dozen characters: no need to tokenize a long tail
+    tokens = llm.tokenize(text[:max_tokens * 16].encode("utf-8"), add_bos=False)
+    if len(tokens) <= max_tokens and len(text) <= max_tokens * 16:
+        return text
+    return llm.detokenize(tokens[:max_tokens]).decode("utf-8", errors="ignore") + "\n... (truncated)"
+
 def run_analyze(transcript_path, action_type="summarize", provider="local",
-                model_name=None, api_key=None, cloud_model=None):
+                model_name=None, api_key=None, cloud_model=None, quant=None):
     """
     MODE 9: ANALYZE
     Summarizes or outlines a transcript using LLM.
@@ -835,19 +2114,27 @@ def run_analyze(transcript_path, action_type="summarize", provider="local",
         print(f"[ERROR] File not found: {transcript_path}")
         return
 
-    with open(transcript_path, "r", encoding="utf-8") as f:
-        content = f.read()
-
-    # Strip headers
-    lines = [l for l in content.split("\n") if l.strip() and not l.startswith("---") and not l.startswith("Source:")]
+    lines = _read_transcript_lines(transcript_path)
     transcript_text = "\n".join(lines)
 
     if not transcript_text.strip():
         print("[ERROR] Transcript is empty")
         return
 
+    llm = None
+    if provider == "local":
+        try:
+            llm = _load_llm(model_name, quant)
+            if llm is None:
+                print("[ERROR] Analysis returned no result")
+                return
+            # Fill the context exactly: whatever the 2048-token answer and the instructions leave free
+            transcript_text = _truncate_to_tokens(llm, transcript_text, llm.n_ctx() - 2048 - PROMPT_SCAFFOLD_TOKENS)
+        except Exception as e:
+            print(f"[ERROR] Analysis failed: {e}")
+            return
     # Truncate if too long (keep first ~8k chars for context window safety)
-    if len(transcript_text) > 8000:
+    elif len(transcript_text) > 8000:
         transcript_text = transcript_text[:8000] + "\n... (truncated)"
 
     if action_type == "summarize":
@@ -865,26 +2152,13 @@ Transcript:
 
 Outline:"""
     elif action_type == "detect_meeting":
-        prompt = f"""Analyze this transcript and determine if it contains a real conversation or meeting, or if it is hallucinated/repetitive nonsense from a speech recognition model.
-
-Signs of HALLUCINATION: identical repeated phrases, single-word loops (e.g. "I" repeated many times), no conversational flow, no topic progression, very short repeated segments.
-Signs of REAL MEETING: varied sentences, questions and answers, topic changes, multiple speakers, natural conversation flow, specific details like names/places/plans.
-
-Respond with ONLY this JSON (no other text):
-{{"has_meeting": true, "confidence": 85, "reason": "one sentence explanation"}}
-
-The confidence field is an integer from 0 to 100 where 100 means absolute certainty.
-
-Transcript:
-{transcript_text}
-
-JSON:"""
+        prompt = DETECT_PROMPT_PREFIX + transcript_text + DETECT_PROMPT_SUFFIX
 
     print(f"[ANALYZE] {action_type.title()} using {provider}...")
 
     try:
         if provider == "local":
-            result = _analyze_local(prompt, model_name)
+            result = _analyze_local(prompt, model_name, llm_instance=llm)
         elif provider == "gemini":
             result = _analyze_gemini(prompt, api_key, cloud_model or "gemini-2.0-flash")
         elif provider == "openai":
@@ -906,6 +2180,7 @@ JSON:"""
 # Cached LLM instance to avoid reloading for batch operations
 _cached_llm = None
 _cached_llm_name = None
+_cached_llm_quant = None
 
 _gguf_models = {
     "llama-3.1-8b": ("bartowski/Meta-Llama-3.1-8B-Instruct-GGUF", "Meta-Llama-3.1-8B-Instruct-Q4_K_M.gguf"),
@@ -915,15 +2190,29 @@ _gguf_models = {
     "gemma-2-2b": ("bartowski/gemma-2-2b-it-GGUF", "gemma-2-2b-it-Q4_K_M.gguf"),
 }
 
-def _load_llm(model_name=None):
+# GGUF quantizations (--llm-quant / TS_LLM_QUANT): Q4_0 decodes fastest on CPU, Q5_K_S/Q8_0 stay closer to full precision
+LLM_QUANTS = ("Q4_0", "Q4_K_M", "Q5_K_S", "Q8_0")
+DEFAULT_LLM_QUANT = os.environ.get("TS_LLM_QUANT", "Q4_K_M").upper()
+
+# (repo_id, filename) -> local GGUF path resolved earlier in this process
+_gguf_paths = {}
+
+def _gguf_filename(filename, quant):
+    """The Q4_K_M filename from _gguf_models renamed for another quantization (same repo, same naming scheme)."""
+    return filename.replace("Q4_K_M", quant).replace("q4_k_m", quant.lower())
+
+def _load_llm(model_name=None, quant=None):
     """Load (or return cached) LLM model for local inference."""
-    global _cached_llm, _cached_llm_name
+    global _cached_llm, _cached_llm_name, _cached_llm_quant
 
     if not model_name or model_name not in _gguf_models:
         model_name = "phi-3-mini"
+    quant = (quant or DEFAULT_LLM_QUANT).upper()
+    if quant not in LLM_QUANTS:
+        quant = "Q4_K_M"
 
     # Return cached if same model
-    if _cached_llm is not None and _cached_llm_name == model_name:
+    if _cached_llm is not None and _cached_llm_name == model_name and _cached_llm_quant == quant:
         return _cached_llm
 
     try:
@@ -936,15 +2225,32 @@ def _load_llm(model_name=None):
 
     try:
         from huggingface_hub import hf_hub_download
-        print(f"[ANALYZE] Downloading/loading {model_name} ({filename})...")
-        model_path = hf_hub_download(repo_id=repo_id, filename=filename)
     except ImportError:
         print("[ERROR] huggingface-hub not installed")
         return None
+    try:
+        filename = _gguf_filename(filename, quant)
+        print(f"[ANALYZE] Downloading/loading {model_name} ({filename})...")
+        model_path = _gguf_paths.get((repo_id, filename))
+        if model_path is None:
+            try:
+                # Already downloaded: resolve from the local cache without the hub's HEAD request
+                model_path = hf_hub_download(repo_id=repo_id, filename=filename, local_files_only=True)
+            except Exception:
+                model_path = hf_hub_download(repo_id=repo_id, filename=filename)
+            _gguf_paths[(repo_id, filename)] = model_path
     except Exception as e:
-        print(f"[ERROR] Failed to download model: {e}")
-        return None
-
+        if quant == "Q4_K_M":
+            print(f"[ERROR] Failed to download model: {e}")
+            return None
+        # Not every repo publishes every quantization
+        print(f"[WARNING] {quant} not available for {model_name} ({e}), using Q4_K_M")
+        return _load_llm(model_name, "Q4_K_M")
+
+    # llama.cpp allocates VRAM itself: blocks PyTorch still caches (VAD, embeddings, earlier
+    # whisper runs in the server) must go back to the driver first
+    gc.collect()
+    release_cuda_cache()
     print(f"[ANALYZE] Loading LLM into memory (GPU)...")
     try:
         llm = Llama(
@@ -954,59 +2260,138 @@ def _load_llm(model_name=None):
             verbose=False
         )
         print(f"[ANALYZE] LLM loaded on GPU successfully")
-        _cached_llm = llm
-        _cached_llm_name = model_name
-        return llm
     except Exception as e:
-        print(f"[WARNING] GPU loading failed ({e}), falling back to CPU...")
-        try:
-            llm = Llama(
-                model_path=model_path,
-                n_ctx=4096,
-                n_gpu_layers=0,  # CPU fallback
-                verbose=False
-            )
-            print(f"[ANALYZE] LLM loaded on CPU (GPU unavailable — VRAM may be in use by Whisper)")
-            _cached_llm = llm
-            _cached_llm_name = model_name
-            return llm
-        except Exception as e2:
-            print(f"[ERROR] Failed to load LLM on both GPU and CPU: {e2}")
-            return None
+        llm = None
+        # Whisper may hold part of the VRAM: offload as many layers as still fit before giving up on the GPU
+        gpu_layers = _gpu_layers_that_fit(model_path)
+        if gpu_layers > 0:
+            print(f"[WARNING] Full GPU offload failed ({e}), trying {gpu_layers} layers on GPU...")
+            try:
+                llm = Llama(
+                    model_path=model_path,
+                    n_ctx=4096,
+                    n_gpu_layers=gpu_layers,
+                    n_threads=CPU_THREADS,
+                    verbose=False
+                )
+                print(f"[ANALYZE] LLM loaded with {gpu_layers} layers on GPU, the rest on CPU")
+            except Exception as partial_error:
+                e = partial_error  # ("except ... as e" would unbind e when the block ends)
+        if llm is None:
+            print(f"[WARNING] GPU loading failed ({e}), falling back to CPU...")
+            try:
+                llm = Llama(
+                    model_path=model_path,
+                    n_ctx=4096,
+                    n_gpu_layers=0,  # CPU fallback
+                    n_threads=CPU_THREADS,  # Decode is memory-bound: one thread per physical core
+                    verbose=False
+                )
+                print(f"[ANALYZE] LLM loaded on CPU (GPU unavailable — VRAM may be in use by Whisper)")
+            except Exception as e2:
+                print(f"[ERROR] Failed to load LLM on both GPU and CPU: {e2}")
+                return None
+    _cached_llm = llm
+    _cached_llm_name = model_name
+    _cached_llm_quant = quant
+    return llm
+
+# Share of free VRAM a partial offload may use; the rest is left for the KV cache and CUDA scratch buffers
+LLM_VRAM_FRACTION = 0.8
+
+def _unload_llm():
+    """Release the cached local LLM (weights and KV cache). Returns False if none was loaded."""
+    global _cached_llm, _cached_llm_name, _cached_llm_quant
+    if _cached_llm is None:
+        return False
+    print(f"[ANALYZE] Unloading {_cached_llm_name} LLM...")
+    llm, _cached_llm, _cached_llm_name, _cached_llm_quant = _cached_llm, None, None, None
+    if hasattr(llm, "close"):
+        llm.close()
+    del llm
+    gc.collect()
+    return True
+
+def _gpu_layers_that_fit(model_path):
+    """Number of transformer layers that fit in the currently free VRAM (0 without CUDA)."""
+    try:
+        import torch
+        if not torch.cuda.is_available():
+            return 0
+        free_bytes = torch.cuda.mem_get_info()[0]
+        from llama_cpp import Llama
+        # vocab_only reads the GGUF metadata without loading any weights
+        metadata = Llama(model_path=model_path, vocab_only=True, verbose=False).metadata
+        layers = int(metadata.get(f"{metadata.get('general.architecture', '')}.block_count", 0))
+    except Exception:
+        return 0
+    per_layer = os.path.getsize(model_path) / max(layers, 1)
+    return max(0, min(layers, int(free_bytes * LLM_VRAM_FRACTION / per_layer)))
 
-def _analyze_local(prompt, model_name=None, llm_instance=None):
-    """Run analysis using llama-cpp-python with a GGUF model."""
-    llm = llm_instance or _load_llm(model_name)
+def _analyze_local(prompt, model_name=None, llm_instance=None, quant=None, grammar=None, max_tokens=2048,
+                   log=None):
+    """
+    Run analysis using llama-cpp-python with a GGUF model.
+    prompt: text, or token ids already tokenized by the model; grammar: optional LlamaGrammar constraint;
+    log: list that collects the progress lines instead of printing them.
+    """
+    llm = llm_instance or _load_llm(model_name, quant)
     if llm is None:
         return None
 
-    print(f"[ANALYZE] Running local inference...")
+    say = print if log is None else log.append
+    say(f"[ANALYZE] Running local inference...")
     try:
         output = llm(
             prompt,
-            max_tokens=2048,
+            max_tokens=max_tokens,
             temperature=0.3,
             stop=["\n\n\n"],
+            grammar=grammar,
         )
         return output["choices"][0]["text"].strip()
     except Exception as e:
-        print(f"[ERROR] Local inference failed: {e}")
+        say(f"[ERROR] Local inference failed: {e}")
         return None
 
 
-def _analyze_gemini(prompt, api_key, model="gemini-2.0-flash"):
+# API clients reused across calls (and detection threads) so requests share pooled keep-alive connections
+_cloud_clients = {}
+
+def _cloud_client(provider, api_key):
+    """Cached OpenAI/Anthropic client for (provider, api_key); both clients are thread-safe."""
+    client = _cloud_clients.get((provider, api_key))
+    if client is None:
+        if provider == "claude":
+            import anthropic
+            client = anthropic.Anthropic(api_key=api_key)
+        else:
+            from openai import OpenAI
+            if provider == "gemini":
+                client = OpenAI(api_key=api_key, base_url="https://generativelanguage.googleapis.com/v1beta/openai/")
+            else:
+                client = OpenAI(api_key=api_key)
+        client = _cloud_clients.setdefault((provider, api_key), client)
+    return client
+
+def _json_schema_format(schema):
+    """OpenAI-style response_format forcing output that matches schema."""
+    return {"type": "json_schema", "json_schema": {"name": "result", "schema": schema, "strict": True}}
+
+def _analyze_gemini(prompt, api_key, model="gemini-2.0-flash", json_schema=None, max_tokens=2048):
     """Run analysis using Google Gemini API via openai-compatible endpoint."""
     if not api_key:
         print("[ERROR] Gemini API key required")
         return None
     try:
-        from openai import OpenAI
-        client = OpenAI(api_key=api_key, base_url="https://generativelanguage.googleapis.com/v1beta/openai/")
+        client = _cloud_client("gemini", api_key)
+        extra = {"response_format": _json_schema_format(json_schema)} if json_schema else {}
         response = client.chat.completions.create(
             model=model,
             messages=[{"role": "user", "content": prompt}],
-            max_tokens=2048,
+            max_tokens=max_tokens,
             temperature=0.3,
+            **extra,
         )
         return response.choices[0].message.content
     except ImportError:
@@ -1017,19 +2402,20 @@ def _analyze_gemini(prompt, api_key, model="gemini-2.0-flash"):
         return None
 
 
-def _analyze_openai(prompt, api_key, model="gpt-4o"):
+def _analyze_openai(prompt, api_key, model="gpt-4o", json_schema=None, max_tokens=2048):
     """Run analysis using OpenAI API."""
     if not api_key:
         print("[ERROR] OpenAI API key required")
         return None
     try:
-        from openai import OpenAI
-        client = OpenAI(api_key=api_key)
+        client = _cloud_client("openai", api_key)
+        extra = {"response_format": _json_schema_format(json_schema)} if json_schema else {}
         response = client.chat.completions.create(
             model=model,
             messages=[{"role": "user", "content": prompt}],
-            max_tokens=2048,
+            max_tokens=max_tokens,
             temperature=0.3,
+            **extra,
         )
         return response.choices[0].message.content
     except ImportError:
@@ -1040,14 +2426,22 @@ def _analyze_openai(prompt, api_key, model="gpt-4o"):
         return None
 
 
-def _analyze_claude(prompt, api_key, model="claude-sonnet-4-20250514"):
-    """Run analysis using Anthropic Claude API."""
+def _analyze_claude(prompt, api_key, model="claude-sonnet-4-20250514", json_schema=None, max_tokens=2048):
+    """Run analysis using Anthropic Claude API (json_schema: answer through a forced tool call)."""
     if not api_key:
         print("[ERROR] Claude API key required")
         return None
     try:
-        import anthropic
-        client = anthropic.Anthropic(api_key=api_key)
+        client = _cloud_client("claude", api_key)
+        if json_schema:
+            response = client.messages.create(
+                model=model,
+                max_tokens=max_tokens,
+                messages=[{"role": "user", "content": prompt}],
+                tools=[{"name": "answer", "description": "Report the result", "input_schema": json_schema}],
+                tool_choice={"type": "tool", "name": "answer"},
+            )
+            return next(json.dumps(b.input) for b in response.content if b.type == "tool_use")
         response = client.messages.create(
             model=model,
             max_tokens=2048,
@@ -1067,12 +2461,267 @@ def _analyze_claude(prompt, api_key, model="claude-sonnet-4-20250514"):
 #   Batch-scans transcripts using LLM to classify real vs hallucinated.
 # =============================================================================
 
+# Fast-path detection (--fast-detect): only clear-cut transcripts skip the LLM.
+# Character-trigram entropy in bits; Whisper loops ("I I I ...") sit far below real conversation
+DETECT_ENTROPY_LOW = 6.0
+DETECT_ENTROPY_HIGH = 9.5
+# Below this many words the trigram count alone caps the entropy, so a short genuine
+# exchange would read as a loop: the entropy rule only judges longer transcripts
+DETECT_ENTROPY_MIN_WORDS = 40
+# Mean pairwise cosine similarity of line embeddings: near-duplicate lines vs. varied content
+DETECT_COSINE_HIGH = 0.85
+DETECT_COSINE_LOW = 0.30
+# Lines embedded per transcript for the similarity feature
+DETECT_EMBED_LINES = 256
+
+def _trigram_entropy(texts):
+    """Shannon entropy (bits) of the character-trigram distribution of the joined lines."""
+    import math
+    from collections import Counter
+    joined = " ".join(texts)
+    counts = Counter(joined[i:i + 3] for i in range(len(joined) - 2))
+    total = sum(counts.values())
+    if not total:
+        return 0.0
+    return -sum(c / total * math.log2(c / total) for c in counts.values())
+
+def _mean_line_similarity(texts, embed_model):
+    """Mean cosine similarity over all pairs of (up to DETECT_EMBED_LINES) lines."""
+    import numpy as np
+    texts = texts[:DETECT_EMBED_LINES]
+    n = len(texts)
+    if n < 2:
+        return None
+    emb = embed_model.encode(texts, batch_size=64, show_progress_bar=False,
+                             convert_to_numpy=True, normalize_embeddings=True)
+    # Sum of all pairwise dot products of unit vectors = |sum|^2; drop the n self-pairs
+    total = emb.sum(axis=0, dtype=np.float64)
+    return float((total @ total - n) / (n * (n - 1)))
+
+def _load_detect_embedder():
+    """MiniLM for the fast path; on CPU its Linear layers run as dynamic int8 (ample for a similarity score)."""
+    from sentence_transformers import SentenceTransformer
+    embed_model = SentenceTransformer("all-MiniLM-L6-v2")
+    if embed_model.device.type == "cpu":
+        try:
+            import torch
+            embed_model = torch.quantization.quantize_dynamic(embed_model, {torch.nn.Linear}, dtype=torch.qint8)
+        except Exception as e:
+            print(f"[DETECT] int8 quantization unavailable ({e}), using FP32 embeddings")
+    return embed_model
+
+def _fast_detect(texts, embed_model=None):
+    """(has_meeting, confidence, reason) when cheap features settle it, None when the LLM should decide."""
+    entropy = _trigram_entropy(texts)
+    words = sum(len(t.split()) for t in texts)
+    if entropy < DETECT_ENTROPY_LOW and words >= DETECT_ENTROPY_MIN_WORDS:
+        return False, 95, f"Low text entropy ({entropy:.1f} bits)"
+    if embed_model is None:
+        return None
+    similarity = _mean_line_similarity(texts, embed_model)
+    if similarity is None:
+        return None
+    if similarity > DETECT_COSINE_HIGH:
+        return False, 90, f"Near-duplicate lines (mean similarity {similarity:.2f})"
+    if entropy > DETECT_ENTROPY_HIGH and similarity < DETECT_COSINE_LOW:
+        return True, 80, f"Varied content (entropy {entropy:.1f} bits, mean similarity {similarity:.2f})"
+    return None
+
+# Detection answers are one small JSON object: constrained decoding stops the model rambling
+DETECT_MAX_TOKENS = 128
+# Transcript tokens shown to the local model for detection (about the old 4000-character cut)
+DETECT_TRANSCRIPT_TOKENS = 1024
+# Files below this size hold at most a header; files above the read cap are judged on their start
+DETECT_MIN_BYTES = 64
+DETECT_MAX_READ_CHARS = 8 * 1024 * 1024
+DETECT_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "has_meeting": {"type": "boolean"},
+        "confidence": {"type": "integer"},
+        "reason": {"type": "string"},
+    },
+    "required": ["has_meeting", "confidence", "reason"],
+    "additionalProperties": False,
+}
+# The reason is capped at 200 characters (about 50 tokens), so the closing brace always
+# fits inside DETECT_MAX_TOKENS and the answer parses
+DETECT_GRAMMAR = r'''
+root ::= "{" ws "\"has_meeting\":" ws boolean "," ws "\"confidence\":" ws confidence "," ws "\"reason\":" ws string ws "}"
+boolean ::= "true" | "false"
+confidence ::= "100" | [1-9] [0-9] | [0-9]
+string ::= "\"" [^"\\\n]{0,200} "\""
+ws ::= " "?
+'''
+_detect_grammar = None  # False once neither grammar compiled: decoding then runs unconstrained
+
+def _get_detect_grammar():
+    """
+    Compiled LlamaGrammar for DETECT_GRAMMAR (built once). Older llama.cpp GBNF parsers
+    reject the {0,200} repetition: they get the unbounded reason instead, or no grammar
+    at all, and the answer parser with its keyword fallback handles the rest.
+    """
+    global _detect_grammar
+    if _detect_grammar is None:
+        from llama_cpp import LlamaGrammar
+        try:
+            _detect_grammar = LlamaGrammar.from_string(DETECT_GRAMMAR, verbose=False)
+        except Exception as e:
+            print(f"[DETECT] Bounded grammar not supported by this llama-cpp-python ({e}), using an unbounded reason")
+            try:
+                _detect_grammar = LlamaGrammar.from_string(
+                    DETECT_GRAMMAR.replace("{0,200}", "*"), verbose=False)
+            except Exception as e:
+                print(f"[DETECT] Detection grammar unavailable ({e}), decoding unconstrained")
+                _detect_grammar = False
+    return _detect_grammar or None
+
+def _detect_prompt_tokens(llm, transcript_text):
+    """
+    Detection prompt as token ids for the local model. The instructions are tokenized once
+    per model, so every file's prompt starts with exactly the same tokens (no merge across
+    the prefix/transcript boundary) and llama.cpp reuses their KV entries.
+    """
+    parts = getattr(llm, "_turbo_detect_prompt", None)
+    if parts is None:
+        parts = llm._turbo_detect_prompt = (
+            llm.tokenize(DETECT_PROMPT_PREFIX.encode("utf-8"), add_bos=True),
+            llm.tokenize(b"\n... (truncated)", add_bos=False),
+            llm.tokenize(DETECT_PROMPT_SUFFIX.encode("utf-8"), add_bos=False),
+        )
+    head, truncated, tail = parts
+    # Only a bounded prefix of a long transcript is tokenized (a token spans at most a few dozen characters)
+    body = llm.tokenize(transcript_text[:DETECT_TRANSCRIPT_TOKENS * 16].encode("utf-8"), add_bos=False)
+    if len(body) > DETECT_TRANSCRIPT_TOKENS:
+        body = body[:DETECT_TRANSCRIPT_TOKENS] + truncated
+    return head + body + tail
+
+def _detect_one(fpath, provider, model_name=None, api_key=None, cloud_model=None,
+                llm_instance=None, embed_model=None, fast_detect=False):
+    """
+    Classify one transcript. Returns (entry, log_lines): entry is its result dict
+    (None for an unknown provider); the caller prints log_lines, so files
+    classified concurrently don't interleave their output.
+    """
+    log = []
+    try:
+        # Smaller than a block header: nothing to read or classify
+        if os.path.getsize(fpath) < DETECT_MIN_BYTES:
+            log.append(f"  [SKIP] Empty transcript")
+            return {"file": fpath, "has_meeting": False,
+                    "confidence": 100, "reason": "Empty transcript"}, log
+
+        lines = _read_transcript_lines(fpath, max_chars=DETECT_MAX_READ_CHARS)
+        transcript_text = "\n".join(lines)
+
+        if not transcript_text.strip():
+            log.append(f"  [SKIP] Empty transcript")
+            return {"file": fpath, "has_meeting": False,
+                    "confidence": 100, "reason": "Empty transcript"}, log
+
+        # Quick heuristic pre-filter: if >80% of lines are identical, skip LLM
+        # lines are already non-blank, and the text after the last "]" is the same whether or not
+        # the line was stripped first, so the texts come straight from lines in one pass
+        if len(lines) > 5:
+            # Extract text after timestamp brackets (rfind's -1 for "no bracket" keeps the whole line)
+            texts = [l[l.rfind("]") + 1:].strip() for l in lines]
+            unique_ratio = len(set(texts)) / len(texts) if texts else 0
+            if unique_ratio < 0.15:
+                log.append(f"  [NO_MEETING] Repetition ratio {unique_ratio:.2f} — clearly hallucinated")
+                return {"file": fpath, "has_meeting": False,
+                        "confidence": 99, "reason": f"Extreme repetition (unique ratio: {unique_ratio:.2f})"}, log
+
+            if fast_detect:
+                decided = _fast_detect(texts, embed_model)
+                if decided is not None:
+                    has_meeting, confidence, reason = decided
+                    tag = "MEETING_DETECTED" if has_meeting else "NO_MEETING"
+                    log.append(f"  [{tag}] confidence={confidence} — {reason} (fast path)")
+                    return {"file": fpath, "has_meeting": has_meeting,
+                            "confidence": confidence, "reason": reason}, log
+
+        # Truncate for LLM context window (detection needs less than summary)
+        if llm_instance is not None:
+            prompt = _detect_prompt_tokens(llm_instance, transcript_text)
+        else:
+            if len(transcript_text) > 4000:
+                transcript_text = transcript_text[:4000] + "\n... (truncated)"
+            prompt = DETECT_PROMPT_PREFIX + transcript_text + DETECT_PROMPT_SUFFIX
+
+        # Call LLM
+        if provider == "local":
+            result_text = _analyze_local(prompt, model_name, llm_instance=llm_instance,
+                                         grammar=_get_detect_grammar(), max_tokens=DETECT_MAX_TOKENS, log=log)
+        elif provider == "gemini":
+            result_text = _analyze_gemini(prompt, api_key, cloud_model or "gemini-2.0-flash",
+                                          json_schema=DETECT_SCHEMA, max_tokens=DETECT_MAX_TOKENS)
+        elif provider == "openai":
+            result_text = _analyze_openai(prompt, api_key, cloud_model or "gpt-4o",
+                                          json_schema=DETECT_SCHEMA, max_tokens=DETECT_MAX_TOKENS)
+        elif provider == "claude":
+            result_text = _analyze_claude(prompt, api_key, cloud_model or "claude-sonnet-4-20250514",
+                                          json_schema=DETECT_SCHEMA, max_tokens=DETECT_MAX_TOKENS)
+        else:
+            log.append(f"  [ERROR] Unknown provider: {provider}")
+            return None, log
+
+        if not result_text:
+            log.append(f"  [ERROR] LLM returned no result")
+            return {"file": fpath, "has_meeting": False,
+                    "confidence": 0, "reason": "LLM returned no result"}, log
+
+        # Parse JSON from LLM response
+        try:
+            # Try to extract JSON from response (LLM may add extra text)
+            json_start = result_text.find("{")
+            json_end = result_text.rfind("}") + 1
+            if json_start >= 0 and json_end > json_start:
+                parsed = json.loads(result_text[json_start:json_end])
+            else:
+                parsed = json.loads(result_text)
+
+            has_meeting = parsed.get("has_meeting", False)
+            confidence = int(parsed.get("confidence", 50))
+            # Normalize if LLM returned 0.0-1.0 instead of 0-100
+            if isinstance(parsed.get("confidence"), float) and parsed["confidence"] <= 1.0:
+                confidence = int(parsed["confidence"] * 100)
+            reason = parsed.get("reason", "")
+        except json.JSONDecodeError:
+            # Fallback: look for keywords in response
+            has_meeting = "true" in result_text.lower() and "has_meeting" in result_text.lower()
+            confidence = 50
+            reason = f"Could not parse JSON: {result_text[:100]}"
+
+        tag = "MEETING_DETECTED" if has_meeting else "NO_MEETING"
+        log.append(f"  [{tag}] confidence={confidence} — {reason}")
+
+        return {
+            "file": fpath,
+            "has_meeting": has_meeting,
+            "confidence": confidence,
+            "reason": reason
+        }, log
+
+    except Exception as e:
+        log.append(f"  [ERROR] {e}")
+        return {"file": fpath, "has_meeting": False,
+                "confidence": 0, "reason": str(e)}, log
+
+# Cloud detection requests in flight at once (network-bound, so threads suffice)
+DETECT_CLOUD_WORKERS = 8
+# Per-file log lines are written out in batches: every this many files, or sooner once this many seconds pass
+DETECT_LOG_FLUSH_FILES = 32
+DETECT_LOG_FLUSH_SECONDS = 0.5
+
 def run_detect_meetings(directory, provider="local", model_name=None,
-                        api_key=None, cloud_model=None, transcript_dir=None, skip_checked=False):
+                        api_key=None, cloud_model=None, transcript_dir=None, skip_checked=False, quant=None,
+                        fast_detect=False):
     """
     MODE 10: DETECT MEETINGS
     Scans all transcript files and uses LLM to determine if each
     contains a real meeting/conversation or is hallucinated.
+    fast_detect: settle clear-cut files from text entropy and line-embedding
+    similarity (all-MiniLM-L6-v2) and only send borderline ones to the LLM.
     """
     # Collect transcript files
     transcript_files = []
@@ -1084,13 +2733,10 @@ def run_detect_meetings(directory, provider="local", model_name=None,
 
     seen = set()
     for d in search_dirs:
-        for root, _, files in os.walk(d):
-            for f in files:
-                if "_transcript" in f and f.endswith(".txt"):
-                    fpath = os.path.abspath(os.path.join(root, f))
-                    if fpath not in seen:
-                        seen.add(fpath)
-                        transcript_files.append(fpath)
+        for fpath in find_transcript_files(d):
+            if fpath not in seen:
+                seen.add(fpath)
+                transcript_files.append(fpath)
 
     total = len(transcript_files)
     print(f"[DETECT] Found {total} transcript files to analyze")
@@ -1108,14 +2754,13 @@ def run_detect_meetings(directory, provider="local", model_name=None,
         report_path = os.path.join(directory, "detection_report.json")
         if os.path.exists(report_path):
             try:
-                with open(report_path, "r", encoding="utf-8") as rf:
-                    prev_results = json.load(rf)
-                    for r in prev_results:
-                        previously_checked.add(os.path.abspath(r.get("file", "")))
-                    # Carry forward previous results
-                    results.extend(prev_results)
-                    meetings_found += sum(1 for r in prev_results if r.get("has_meeting"))
-                    print(f"[DETECT] Loaded {len(prev_results)} previously checked files, skipping them")
+                prev_results = read_json_report(report_path)
+                for r in prev_results:
+                    previously_checked.add(os.path.abspath(r.get("file", "")))
+                # Carry forward previous results
+                results.extend(prev_results)
+                meetings_found += sum(1 for r in prev_results if r.get("has_meeting"))
+                print(f"[DETECT] Loaded {len(prev_results)} previously checked files, skipping them")
             except Exception as ex:
                 print(f"[WARNING] Could not load previous report: {ex}")
         
@@ -1130,127 +2775,68 @@ def run_detect_meetings(directory, provider="local", model_name=None,
     # Pre-load LLM once for the entire batch (avoids reloading per file)
     llm_instance = None
     if provider == "local":
-        llm_instance = _load_llm(model_name)
+        llm_instance = _load_llm(model_name, quant)
         if llm_instance is None:
             print("[ERROR] Failed to load local LLM model. Aborting.")
             return
 
-    for i, fpath in enumerate(transcript_files, 1):
-        fname = os.path.basename(fpath)
-        print(f"\n[{i}/{total}] Analyzing: {fname}")
-        print(f"[DETECT_PROGRESS] {i}/{total} — {fname}")
-
+    embed_model = None
+    if fast_detect:
         try:
-            with open(fpath, "r", encoding="utf-8") as f:
-                content = f.read()
-
-            # Strip headers
-            lines = [l for l in content.split("\n")
-                     if l.strip() and not l.startswith("---") and not l.startswith("Source:")]
-            transcript_text = "\n".join(lines)
-
-            if not transcript_text.strip():
-                print(f"  [SKIP] Empty transcript")
-                results.append({"file": fpath, "has_meeting": False,
-                                "confidence": 100, "reason": "Empty transcript"})
-                continue
-
-            # Quick heuristic pre-filter: if >80% of lines are identical, skip LLM
-            line_list = [l.strip() for l in lines if l.strip()]
-            if len(line_list) > 5:
-                # Extract text after timestamp brackets
-                texts = []
-                for l in line_list:
-                    bracket_end = l.rfind("]")
-                    if bracket_end >= 0:
-                        texts.append(l[bracket_end+1:].strip())
-                    else:
-                        texts.append(l)
-                unique_ratio = len(set(texts)) / len(texts) if texts else 0
-                if unique_ratio < 0.15:
-                    print(f"  [NO_MEETING] Repetition ratio {unique_ratio:.2f} — clearly hallucinated")
-                    results.append({"file": fpath, "has_meeting": False,
-                                    "confidence": 99, "reason": f"Extreme repetition (unique ratio: {unique_ratio:.2f})"})
-                    continue
-
-            # Truncate for LLM context window (detection needs less than summary)
-            if len(transcript_text) > 4000:
-                transcript_text = transcript_text[:4000] + "\n... (truncated)"
-
-            # Use run_analyze infrastructure
-            prompt = f"""Analyze this transcript and determine if it contains a real conversation or meeting, or if it is hallucinated/repetitive nonsense from a speech recognition model.
-
-Signs of HALLUCINATION: identical repeated phrases, single-word loops (e.g. "I" repeated many times), no conversational flow, no topic progression, very short repeated segments.
-Signs of REAL MEETING: varied sentences, questions and answers, topic changes, multiple speakers, natural conversation flow, specific details like names/places/plans.
-
-Respond with ONLY this JSON (no other text):
-{{"has_meeting": true, "confidence": 85, "reason": "one sentence explanation"}}
-
-The confidence field is an integer from 0 to 100 where 100 means absolute certainty.
-
-Transcript:
-{transcript_text}
-
-JSON:"""
-
-            # Call LLM
-            if provider == "local":
-                result_text = _analyze_local(prompt, model_name, llm_instance=llm_instance)
-            elif provider == "gemini":
-                result_text = _analyze_gemini(prompt, api_key, cloud_model or "gemini-2.0-flash")
-            elif provider == "openai":
-                result_text = _analyze_openai(prompt, api_key, cloud_model or "gpt-4o")
-            elif provider == "claude":
-                result_text = _analyze_claude(prompt, api_key, cloud_model or "claude-sonnet-4-20250514")
-            else:
-                print(f"  [ERROR] Unknown provider: {provider}")
-                continue
-
-            if not result_text:
-                print(f"  [ERROR] LLM returned no result")
-                results.append({"file": fpath, "has_meeting": False,
-                                "confidence": 0, "reason": "LLM returned no result"})
-                continue
-
-            # Parse JSON from LLM response
-            try:
-                # Try to extract JSON from response (LLM may add extra text)
-                json_start = result_text.find("{")
-                json_end = result_text.rfind("}") + 1
-                if json_start >= 0 and json_end > json_start:
-                    parsed = json.loads(result_text[json_start:json_end])
-                else:
-                    parsed = json.loads(result_text)
-
-                has_meeting = parsed.get("has_meeting", False)
-                confidence = int(parsed.get("confidence", 50))
-                # Normalize if LLM returned 0.0-1.0 instead of 0-100
-                if isinstance(parsed.get("confidence"), float) and parsed["confidence"] <= 1.0:
-                    confidence = int(parsed["confidence"] * 100)
-                reason = parsed.get("reason", "")
-            except json.JSONDecodeError:
-                # Fallback: look for keywords in response
-                has_meeting = "true" in result_text.lower() and "has_meeting" in result_text.lower()
-                confidence = 50
-                reason = f"Could not parse JSON: {result_text[:100]}"
-
-            tag = "MEETING_DETECTED" if has_meeting else "NO_MEETING"
-            print(f"  [{tag}] confidence={confidence} — {reason}")
-
-            if has_meeting:
+            embed_model = _load_detect_embedder()
+        except Exception as e:
+            print(f"[DETECT] Embedding model unavailable ({e}), fast path uses text entropy only")
+
+    import time
+    log_buf = []
+    buffered_files = 0
+    last_flush = time.monotonic()
+    last_announce = 0.0  # the first file is always shown straight away
+
+    def flush_log():
+        nonlocal buffered_files, last_flush
+        emit(log_buf)
+        log_buf.clear()
+        buffered_files = 0
+        last_flush = time.monotonic()
+
+    def announce(i, fpath):
+        nonlocal last_announce
+        fname = os.path.basename(fpath)
+        log_buf.append(f"\n[{i}/{total}] Analyzing: {fname}\n")
+        log_buf.append(f"[DETECT_PROGRESS] {i}/{total} — {fname}\n")
+        # Slow files (local LLM): show progress before the work starts, as before
+        now = time.monotonic()
+        if now - last_announce >= DETECT_LOG_FLUSH_SECONDS:
+            flush_log()
+        last_announce = now
+
+    def record(entry, log):
+        nonlocal meetings_found, buffered_files
+        log_buf.extend(line + "\n" for line in log)
+        buffered_files += 1
+        if buffered_files >= DETECT_LOG_FLUSH_FILES or time.monotonic() - last_flush >= DETECT_LOG_FLUSH_SECONDS:
+            flush_log()
+        if entry is not None:
+            results.append(entry)
+            if entry["has_meeting"]:
                 meetings_found += 1
 
-            results.append({
-                "file": fpath,
-                "has_meeting": has_meeting,
-                "confidence": confidence,
-                "reason": reason
-            })
-
-        except Exception as e:
-            print(f"  [ERROR] {e}")
-            results.append({"file": fpath, "has_meeting": False,
-                            "confidence": 0, "reason": str(e)})
+    detect_args = (provider, model_name, api_key, cloud_model, llm_instance, embed_model, fast_detect)
+    if provider in ("gemini", "openai", "claude") and total > 1:
+        # Requests overlap; results are still reported in file order
+        from concurrent.futures import ThreadPoolExecutor
+        with ThreadPoolExecutor(max_workers=DETECT_CLOUD_WORKERS) as pool:
+            futures = [pool.submit(_detect_one, fpath, *detect_args) for fpath in transcript_files]
+            for i, (fpath, future) in enumerate(zip(transcript_files, futures), 1):
+                announce(i, fpath)
+                record(*future.result())
+    else:
+        # One local model instance, which already uses every core (or the GPU): files go through it in turn
+        for i, fpath in enumerate(transcript_files, 1):
+            announce(i, fpath)
+            record(*_detect_one(fpath, *detect_args))
+    flush_log()
 
     print(f"\n{'='*60}")
     print(f"MEETING DETECTION COMPLETE")
@@ -1265,21 +2851,260 @@ JSON:"""
             if r["has_meeting"]:
                 print(f"  ✅ {os.path.basename(r['file'])} ({r['confidence']}%) — {r['reason']}")
 
-    print(f"\n[DETECTION_REPORT] {json.dumps(results)}")
+    print(f"\n[DETECTION_REPORT] {dumps_json(results)}")
 
     # Save report to file for --skip-checked feature
     report_path = os.path.join(directory, "detection_report.json")
     try:
-        with open(report_path, "w", encoding="utf-8") as rf:
-            json.dump(results, rf, indent=2)
+        write_json_report(report_path, results)
         print(f"[DETECT] Report saved to {report_path}")
     except Exception as ex:
         print(f"[WARNING] Could not save report: {ex}")
 
+# Server: transcription model loaded in the background at startup
+SERVER_PRELOAD_MODEL = "large-v3"
+# Server: transcription models kept resident next to tiny.en (bounded by VRAM)
+SERVER_MAX_MODELS = 2
+# Server: before loading another model, evict (LLM first, then least recently used Whisper)
+# until the new model's estimate is free. (name fragment, GB for FP16 weights plus batch
+# workspace); first match wins, unknown names assume a large model
+WHISPER_VRAM_GB = (("tiny", 1), ("base", 1), ("small", 2), ("distil", 3), ("turbo", 3),
+                   ("medium", 4), ("large", 6))
+SERVER_DEFAULT_VRAM_GB = 6
+
+def estimate_model_vram_gb(model_name):
+    """Rough VRAM a Whisper model needs once loaded, from WHISPER_VRAM_GB."""
+    name = model_name.lower()
+    return next((gb for key, gb in WHISPER_VRAM_GB if key in name), SERVER_DEFAULT_VRAM_GB)
+
+def _free_vram_gb():
+    """Free memory on the CUDA device in GB (llama.cpp and CTranslate2 allocations included)."""
+    import torch
+    return torch.cuda.mem_get_info()[0] / 1024**3
+
+def run_server():
+    """
+    Persistent engine: reads one JSON command per line from stdin.
+    Whisper models stay resident between commands so repeated scans and
+    transcriptions skip the model load and CUDA init.
+    """
+    print("[SERVER] Initializing engine...", flush=True)
+    
+    # Pre-load Tiny model for fast scanning
+    print("[SERVER] Loading core models...", flush=True)
+    try:
+        # Load tiny model to cache it in VRAM/RAM
+        scanner_model = load_scout_model()
+        # Silero VAD session is cached by faster-whisper: create it now, not on the first scan
+        from faster_whisper.vad import get_vad_model
+        get_vad_model()
+        print("[SERVER] Engine ready.", flush=True)
+    except Exception as e:
+        print(f"[SERVER] Init failed: {e}", flush=True)
+        return
+
+    # tiny.en stays pinned for scans; up to SERVER_MAX_MODELS transcription models are kept
+    # alongside it, least recently used evicted first (dict order = use order)
+    models = {"tiny.en": scanner_model}
+
+    # Load the default transcription model in the background so the first transcribe
+    # doesn't stall on it; commands (ping, scans) are served meanwhile
+    from concurrent.futures import ThreadPoolExecutor, wait
+    preload_pool = ThreadPoolExecutor(max_workers=1)
+    pending = {SERVER_PRELOAD_MODEL: preload_pool.submit(load_whisper_model, SERVER_PRELOAD_MODEL)}
+    preload_pool.shutdown(wait=False)
+
+    def unload_model(name):
+        """Drop a resident model and hand its memory back before the next load."""
+        if name not in models:
+            return False
+        print(f"[SERVER] Unloading {name} model...", flush=True)
+        del models[name]
+        gc.collect()  # CTranslate2 frees the weights once the last reference is gone
+        release_cuda_cache()
+        return True
+
+    def adopt_finished_preloads():
+        """Move preloads that have landed into models, where LRU and VRAM eviction can see them."""
+        for name in [n for n, future in pending.items() if future.done()]:
+            future = pending.pop(name)
+            try:
+                model = future.result()
+            except Exception as e:
+                print(f"[SERVER] Preload of {name} failed: {e}", flush=True)
+                continue
+            if name not in models:
+                models[name] = model
+
+    def get_model(model_name):
+        adopt_finished_preloads()
+        if model_name in models:
+            models[model_name] = models.pop(model_name)  # Mark as most recently used
+            return models[model_name]
+
+        resident = [n for n in models if n != "tiny.en"]
+        while len(resident) >= SERVER_MAX_MODELS:
+            unload_model(resident.pop(0))
+        needed_gb = estimate_model_vram_gb(model_name)
+        while DEVICE == "cuda" and model_name not in pending and _free_vram_gb() < needed_gb:
+            if _unload_llm():
+                pass
+            elif resident:
+                unload_model(resident.pop(0))
+            elif pending:
+                # Only another model's preload is left holding memory: let it land, then drop it
+                name = next(iter(pending))
+                print(f"[SERVER] Waiting for {name} preload to free its memory...", flush=True)
+                wait([pending[name]])
+                adopt_finished_preloads()
+                unload_model(name)
+            else:
+                break
+            release_cuda_cache()
+
+        model = None
+        if model_name in pending:
+            print(f"[SERVER] Waiting for {model_name} preload...", flush=True)
+            try:
+                model = pending.pop(model_name).result()
+            except Exception as e:
+                print(f"[SERVER] Preload of {model_name} failed: {e}", flush=True)
+        if model is None:
+            print(f"[SERVER] Loading {model_name} model...", flush=True)
+            model = load_whisper_model(model_name)
+        models[model_name] = model
+        return model
+
+    while True:
+        try:
+            line = sys.stdin.readline()
+            if not line: break
+            
+            cmd = json.loads(line)
+            action = cmd.get("action")
+            
+            if action == "ping":
+                print(json.dumps({"status": "pong"}), flush=True)
+                
+            elif action == "scan":
+                try:
+                    directory = cmd.get("directory")
+                    use_vad = cmd.get("use_vad", True)
+                    report_path = cmd.get("report_path")
+                    
+                    run_batch_scanner(directory, use_vad=use_vad, report_path=report_path, model=get_model("tiny.en"))
+                    print(json.dumps({"status": "complete", "action": "scan"}), flush=True)
+                except Exception as e:
+                    print(json.dumps({"status": "error", "action": "scan", "message": str(e)}), flush=True)
+
+            elif action == "vad_scan":
+                directory = cmd.get("directory")
+                threshold = cmd.get("vad_threshold", 0.5)
+                report_path = cmd.get("report_path")
+                skip_existing = cmd.get("skip_existing", False)
+                
+                run_batch_vad_scan(directory, threshold=threshold, report_path=report_path, skip_existing=skip_existing)
+                print(json.dumps({"status": "complete", "action": "vad_scan"}), flush=True)
+
+            elif action == "transcribe":
+                # Ensure large-v3 (or requested model) is loaded
+                model_name = cmd.get("model", "large-v3")
+                file_path = cmd.get("file")
+                start = cmd.get("start")
+                end = cmd.get("end")
+                output_dir = cmd.get("output_dir")
+                skip_existing = cmd.get("skip_existing", False)
+                batch_size = cmd.get("batch_size")
+                
+                lines = run_transcriber(file_path, start, end, model=get_model(model_name), model_name=model_name,
+                                        output_dir=output_dir, skip_existing=skip_existing, batch_size=batch_size,
+                                        keep_lines=True)
+                print(json.dumps({"status": "complete", "action": "transcribe", "lines": lines}), flush=True)
+
+            elif action == "batch_transcribe":
+                model_name = cmd.get("model", "large-v3")
+                run_batch_transcriber(cmd.get("report_path"), output_dir=cmd.get("output_dir"),
+                                      skip_existing=cmd.get("skip_existing", False), model_name=model_name,
+                                      beam_size=cmd.get("beam_size", 5), batch_size=cmd.get("batch_size"),
+                                      model=get_model(model_name))
+                print(json.dumps({"status": "complete", "action": "batch_transcribe"}), flush=True)
+
+            elif action == "batch_transcribe_dir":
+                model_name = cmd.get("model", "large-v3")
+                run_batch_transcribe_dir(cmd.get("directory"), use_vad=cmd.get("use_vad", True),
+                                         output_dir=cmd.get("output_dir"), skip_existing=cmd.get("skip_existing", False),
+                                         model_name=model_name, beam_size=cmd.get("beam_size", 5),
+                                         batch_size=cmd.get("batch_size"), model=get_model(model_name))
+                print(json.dumps({"status": "complete", "action": "batch_transcribe_dir"}), flush=True)
+
+            elif action == "transcribe_file":
+                model_name = cmd.get("model", "large-v3")
+                run_transcribe_file(cmd.get("file"), model_name=model_name, use_vad=cmd.get("use_vad", True),
+                                    output_dir=cmd.get("output_dir"), skip_existing=cmd.get("skip_existing", False),
+                                    beam_size=cmd.get("beam_size", 5), batch_size=cmd.get("batch_size"),
+                                    model=get_model(model_name))
+                print(json.dumps({"status": "complete", "action": "transcribe_file"}), flush=True)
+
+            elif action == "semantic_search":
+                query = cmd.get("query", "")
+                directory = cmd.get("directory", ".")
+                embed_model_name = cmd.get("embed_model", "all-MiniLM-L6-v2")
+                transcript_dir = cmd.get("transcript_dir")
+                run_semantic_search(directory, query, model_name=embed_model_name, transcript_dir=transcript_dir)
+                print(json.dumps({"status": "complete", "action": "semantic_search"}), flush=True)
+
+            elif action == "analyze":
+                file_path = cmd.get("file", "")
+                analyze_type = cmd.get("analyze_type", "summarize")
+                provider = cmd.get("provider", "local")
+                model_name_llm = cmd.get("model", None)
+                api_key = cmd.get("api_key", None)
+                cloud_model = cmd.get("cloud_model", None)
+                run_analyze(file_path, action_type=analyze_type, provider=provider,
+                            model_name=model_name_llm, api_key=api_key, cloud_model=cloud_model,
+                            quant=cmd.get("quant"))
+                print(json.dumps({"status": "complete", "action": "analyze"}), flush=True)
+
+            elif action == "detect_meetings":
+                directory = cmd.get("directory", ".")
+                provider = cmd.get("provider", "local")
+                model_name_llm = cmd.get("model", None)
+                api_key = cmd.get("api_key", None)
+                cloud_model = cmd.get("cloud_model", None)
+                transcript_dir = cmd.get("transcript_dir", None)
+                run_detect_meetings(directory, provider=provider,
+                                    model_name=model_name_llm, api_key=api_key,
+                                    cloud_model=cloud_model, transcript_dir=transcript_dir,
+                                    quant=cmd.get("quant"), fast_detect=cmd.get("fast_detect", False))
+                print(json.dumps({"status": "complete", "action": "detect_meetings"}), flush=True)
+
+            elif action == "load_llm":
+                # Warm the local LLM before the first analyze/detect_meetings (it stays cached in _load_llm)
+                llm = _load_llm(cmd.get("model"), cmd.get("quant"))
+                print(json.dumps({"status": "complete" if llm is not None else "error", "action": "load_llm",
+                                  "model": _cached_llm_name}), flush=True)
+
+            elif action == "unload":
+                model_name = cmd.get("model", SERVER_PRELOAD_MODEL)
+                pending.pop(model_name, None)  # A preload still in flight is dropped when it lands
+                unloaded = _unload_llm() if model_name == "llm" else unload_model(model_name)
+                print(json.dumps({"status": "complete", "action": "unload", "model": model_name, "unloaded": unloaded}), flush=True)
+
+            elif action == "exit":
+                break
+                
+        except json.JSONDecodeError:
+            print(f"[ERROR] Invalid JSON command", flush=True)
+        except Exception as e:
+            print(f"[ERROR] {e}", flush=True)
+
+# CLI modes that only read/write text (or bring their own runtime): no device probe at startup
+TEXT_ONLY_MODES = {"search_transcripts", "semantic_search", "analyze", "detect_meetings", "load_llm"}
+
 if __name__ == "__main__":
     multiprocessing.freeze_support()  # Needed for PyInstaller on Windows
     parser = argparse.ArgumentParser(description="Fast Whisper Voice Scanner & Transcriber")
-    parser.add_argument("mode", choices=["scan", "batch_scan", "vad_scan", "transcribe", "batch_transcribe", "batch_transcribe_dir", "transcribe_file", "search_transcripts", "semantic_search", "analyze", "detect_meetings", "load_llm", "server"])
+    parser.add_argument("mode", choices=["scan", "batch_scan", "vad_scan", "transcribe", "batch_transcribe", "batch_transcribe_dir", "scan_transcribe", "transcribe_file", "transcribe_daemon", "search_transcripts", "semantic_search", "analyze", "detect_meetings", "load_llm", "server"])
     parser.add_argument("file", nargs="?", help="Path to media file (for scan/transcribe)")
     parser.add_argument("--dir", help="Directory to batch scan or transcribe")
     parser.add_argument("--start", type=float)
@@ -1291,22 +3116,42 @@ if __name__ == "__main__":
     parser.add_argument("--output-dir", help="Directory to save transcript files")
     parser.add_argument("--skip-existing", action="store_true", help="Skip files if transcript already exists")
     parser.add_argument("--device", choices=["auto", "cuda", "cpu"], default="auto", help="Device to use: auto, cuda, or cpu")
+    parser.add_argument("--compute-type", choices=COMPUTE_TYPES, default="auto", help="CTranslate2 compute type for Whisper models. auto: bfloat16 on sm_80+, int8_float16 on sm_75, float16 on older GPUs, int8 on CPU. int8_float16 roughly halves VRAM vs float16")
+    parser.add_argument("--quantize", action="store_true", help="INT8 weights: int8_float16 on GPU, int8 on CPU (same as TS_QUANT=int8; --compute-type takes precedence)")
+    parser.add_argument("--scout-compute", default=SCOUT_COMPUTE, help="CTranslate2 compute type for the tiny.en scout model on GPU (e.g. int8_float16, float16)")
+    parser.add_argument("--cpu-threads", type=int, default=CPU_THREADS, help=f"CPU threads for CTranslate2 and PyTorch (default: half the logical cores, {CPU_THREADS})")
+    parser.add_argument("--num-workers", type=int, default=0, help="Concurrent CTranslate2 workers per model (default: 2 on GPU, 1 on CPU)")
     parser.add_argument("--embed-model", default="all-MiniLM-L6-v2", help="Sentence-transformers model for semantic search")
     parser.add_argument("--transcript-dir", help="Directory containing transcript files")
     parser.add_argument("--provider", choices=["local", "gemini", "openai", "claude"], default="local", help="LLM provider")
     parser.add_argument("--api-key", help="API key for cloud LLM")
     parser.add_argument("--cloud-model", help="Cloud model name")
+    parser.add_argument("--llm-quant", type=str.upper, choices=LLM_QUANTS, default=None, help=f"GGUF quantization for the local LLM (default: {DEFAULT_LLM_QUANT}; Q4_0 is fastest on CPU)")
     parser.add_argument("--analyze-type", choices=["summarize", "outline", "detect_meeting"], default="summarize", help="Analysis type")
     parser.add_argument("--vad-threshold", type=float, default=0.5, help="Silero VAD sensitivity threshold (0.0-1.0, lower = more sensitive)")
     parser.add_argument("--beam-size", type=int, default=None, help="Beam size for transcription (1=greedy/fast, 5=accurate/slow)")
+    parser.add_argument("--batch-size", type=lambda v: None if v == "auto" else int(v), default=None, help="Speech chunks decoded per GPU batch, or 'auto' (default): picked from the VRAM left after the model loads, 1 on CPU")
+    parser.add_argument("--jobs", type=int, default=VAD_SCAN_JOBS, help=f"vad_scan: files scanned in parallel worker processes on CPU (default: {VAD_SCAN_JOBS}; ignored on CUDA)")
+    parser.add_argument("--max-blocks", type=int, default=None, help="scan: stop after the first N voice blocks (quick preview)")
+    parser.add_argument("--quiet", action="store_true", help="Don't echo each transcribed segment as a [TEXT] line")
     parser.add_argument("--skip-checked", action="store_true", help="Skip transcript files already analyzed in previous detection runs")
+    parser.add_argument("--fast-detect", action="store_true", help="detect_meetings: decide clear-cut files from text entropy and embedding similarity, LLM only for borderline ones")
     args = parser.parse_args()
 
-    # Apply device override before any model loading
-    def apply_device_override(device_arg):
-        global DEVICE, COMPUTE
-        DEVICE, COMPUTE = get_device_config(device_arg)
-    apply_device_override(args.device)
+    SCOUT_COMPUTE = args.scout_compute
+    CPU_THREADS = max(1, args.cpu_threads)
+    NUM_WORKERS = max(0, args.num_workers)
+    QUIET_SEGMENTS = args.quiet
+
+    # Apply device override before any model loading; text-only modes never touch torch/CUDA
+    if args.mode not in TEXT_ONLY_MODES:
+        import torch
+        def apply_device_override(device_arg, compute_arg):
+            global DEVICE, COMPUTE
+            DEVICE, COMPUTE = get_device_config(device_arg, compute_arg, quantize=args.quantize or None)
+        apply_device_override(args.device, args.compute_type)
+        configure_torch_backends()
+        torch.set_num_threads(CPU_THREADS)
 
     use_vad = not args.no_vad
 
@@ -1321,8 +3166,9 @@ if __name__ == "__main__":
         else:
             beam = 5
 
+    # Each Whisper model is loaded at most once per process (get_cached_model) and handed to the entry points
     if args.mode == "scan":
-        run_scanner(args.file, use_vad=use_vad, beam_size=beam)
+        run_scanner(args.file, use_vad=use_vad, beam_size=beam, max_blocks=args.max_blocks)
     elif args.mode == "batch_scan":
         directory = args.dir or args.file
         if not directory:
@@ -1334,22 +3180,30 @@ if __name__ == "__main__":
         if not directory:
             print("Error: Provide a directory with --dir or as positional argument")
             exit(1)
-        run_batch_vad_scan(directory, threshold=args.vad_threshold, report_path=args.report, skip_existing=args.skip_existing)
+        run_batch_vad_scan(directory, threshold=args.vad_threshold, report_path=args.report, skip_existing=args.skip_existing, jobs=args.jobs)
     elif args.mode == "transcribe":
-        run_transcriber(args.file, args.start, args.end, output_dir=args.output_dir, skip_existing=args.skip_existing, beam_size=beam)
+        run_transcriber(args.file, args.start, args.end, output_dir=args.output_dir, skip_existing=args.skip_existing, beam_size=beam, batch_size=args.batch_size)
     elif args.mode == "batch_transcribe":
-        run_batch_transcriber(args.report, output_dir=args.output_dir, skip_existing=args.skip_existing, model_name=args.model, beam_size=beam)
+        run_batch_transcriber(args.report, output_dir=args.output_dir, skip_existing=args.skip_existing, model_name=args.model, beam_size=beam, batch_size=args.batch_size)
     elif args.mode == "batch_transcribe_dir":
         directory = args.dir or args.file
         if not directory:
             print("Error: Provide a directory with --dir or as positional argument")
             exit(1)
-        run_batch_transcribe_dir(directory, use_vad=use_vad, output_dir=args.output_dir, skip_existing=args.skip_existing, model_name=args.model, beam_size=beam)
+        run_batch_transcribe_dir(directory, use_vad=use_vad, output_dir=args.output_dir, skip_existing=args.skip_existing, model_name=args.model, beam_size=beam, batch_size=args.batch_size)
+    elif args.mode == "scan_transcribe":
+        directory = args.dir or args.file
+        if not directory:
+            print("Error: Provide a directory with --dir or as positional argument")
+            exit(1)
+        run_scan_then_transcribe(directory, use_vad=use_vad, output_dir=args.output_dir, skip_existing=args.skip_existing, model_name=args.model, beam_size=beam, batch_size=args.batch_size)
     elif args.mode == "transcribe_file":
         if not args.file:
             print("Error: Provide a file path")
             exit(1)
-        run_transcribe_file(args.file, model_name=args.model, use_vad=use_vad, output_dir=args.output_dir, skip_existing=args.skip_existing, beam_size=beam)
+        run_transcribe_file(args.file, model_name=args.model, use_vad=use_vad, output_dir=args.output_dir, skip_existing=args.skip_existing, beam_size=beam, batch_size=args.batch_size)
+    elif args.mode == "transcribe_daemon":
+        run_transcribe_daemon(model_name=args.model, beam_size=beam, batch_size=args.batch_size)
     elif args.mode == "search_transcripts":
         directory = args.dir or "."
         if not args.query:
@@ -1367,129 +3221,20 @@ if __name__ == "__main__":
             print("Error: Provide a transcript file path")
             exit(1)
         run_analyze(args.file, action_type=args.analyze_type, provider=args.provider,
-                    model_name=args.model, api_key=args.api_key, cloud_model=args.cloud_model)
+                    model_name=args.model, api_key=args.api_key, cloud_model=args.cloud_model,
+                    quant=args.llm_quant)
     elif args.mode == "detect_meetings":
         directory = args.dir or args.file or "."
         run_detect_meetings(directory, provider=args.provider,
                            model_name=args.model, api_key=args.api_key,
                            cloud_model=args.cloud_model, transcript_dir=args.transcript_dir,
-                           skip_checked=args.skip_checked)
+                           skip_checked=args.skip_checked, quant=args.llm_quant,
+                           fast_detect=args.fast_detect)
     elif args.mode == "load_llm":
-        llm = _load_llm(args.model if args.model != "large-v1" else None)
+        llm = _load_llm(args.model if args.model != "large-v1" else None, args.llm_quant)
         if llm is not None:
             print(f"[LLM_LOADED] {_cached_llm_name}")
         else:
             print("[LLM_LOAD_FAILED]")
     elif args.mode == "server":
         run_server()
-
-def run_server():
-    print("[SERVER] Initializing engine...", flush=True)
-    
-    # Pre-load Tiny model for fast scanning
-    print("[SERVER] Loading core models...", flush=True)
-    try:
-        # Load tiny model to cache it in VRAM/RAM
-        scanner_model = load_whisper_model("tiny.en")
-        print("[SERVER] Engine ready.", flush=True)
-    except Exception as e:
-        print(f"[SERVER] Init failed: {e}", flush=True)
-        return
-
-    # Keep large model in memory if triggered? For now, load on demand to save VRAM? 
-    # Or maybe keep one global 'current_model' and swap if needed.
-    current_model = scanner_model
-    current_model_name = "tiny.en"
-
-    while True:
-        try:
-            line = sys.stdin.readline()
-            if not line: break
-            
-            cmd = json.loads(line)
-            action = cmd.get("action")
-            
-            if action == "ping":
-                print(json.dumps({"status": "pong"}), flush=True)
-                
-            elif action == "scan":
-                try:
-                    # Ensure tiny model is loaded
-                    if current_model_name != "tiny.en":
-                         print("[SERVER] Switching to tiny.en model...", flush=True)
-                         current_model = load_whisper_model("tiny.en")
-                         current_model_name = "tiny.en"
-                    
-                    directory = cmd.get("directory")
-                    use_vad = cmd.get("use_vad", True)
-                    report_path = cmd.get("report_path")
-                    
-                    run_batch_scanner(directory, use_vad=use_vad, report_path=report_path, model=current_model)
-                    print(json.dumps({"status": "complete", "action": "scan"}), flush=True)
-                except Exception as e:
-                    print(json.dumps({"status": "error", "action": "scan", "message": str(e)}), flush=True)
-
-            elif action == "vad_scan":
-                directory = cmd.get("directory")
-                threshold = cmd.get("vad_threshold", 0.5)
-                report_path = cmd.get("report_path")
-                skip_existing = cmd.get("skip_existing", False)
-                
-                run_batch_vad_scan(directory, threshold=threshold, report_path=report_path, skip_existing=skip_existing)
-                print(json.dumps({"status": "complete", "action": "vad_scan"}), flush=True)
-
-            elif action == "transcribe":
-                # Ensure large-v3 (or requested model) is loaded
-                model_name = cmd.get("model", "large-v3")
-                if current_model_name != model_name:
-                    print(f"[SERVER] Switching to {model_name} model...", flush=True)
-                    current_model = load_whisper_model(model_name)
-                    current_model_name = model_name
-                
-                file_path = cmd.get("file")
-                start = cmd.get("start")
-                end = cmd.get("end")
-                output_dir = cmd.get("output_dir")
-                skip_existing = cmd.get("skip_existing", False)
-                
-                run_transcriber(file_path, start, end, model=current_model, output_dir=output_dir, skip_existing=skip_existing)
-                print(json.dumps({"status": "complete", "action": "transcribe"}), flush=True) 
-
-            elif action == "semantic_search":
-                query = cmd.get("query", "")
-                directory = cmd.get("directory", ".")
-                embed_model_name = cmd.get("embed_model", "all-MiniLM-L6-v2")
-                transcript_dir = cmd.get("transcript_dir")
-                run_semantic_search(directory, query, model_name=embed_model_name, transcript_dir=transcript_dir)
-                print(json.dumps({"status": "complete", "action": "semantic_search"}), flush=True)
-
-            elif action == "analyze":
-                file_path = cmd.get("file", "")
-                analyze_type = cmd.get("analyze_type", "summarize")
-                provider = cmd.get("provider", "local")
-                model_name_llm = cmd.get("model", None)
-                api_key = cmd.get("api_key", None)
-                cloud_model = cmd.get("cloud_model", None)
-                run_analyze(file_path, action_type=analyze_type, provider=provider,
-                            model_name=model_name_llm, api_key=api_key, cloud_model=cloud_model)
-                print(json.dumps({"status": "complete", "action": "analyze"}), flush=True)
-
-            elif action == "detect_meetings":
-                directory = cmd.get("directory", ".")
-                provider = cmd.get("provider", "local")
-                model_name_llm = cmd.get("model", None)
-                api_key = cmd.get("api_key", None)
-                cloud_model = cmd.get("cloud_model", None)
-                transcript_dir = cmd.get("transcript_dir", None)
-                run_detect_meetings(directory, provider=provider,
-                                    model_name=model_name_llm, api_key=api_key,
-                                    cloud_model=cloud_model, transcript_dir=transcript_dir)
-                print(json.dumps({"status": "complete", "action": "detect_meetings"}), flush=True)
-
-            elif action == "exit":
-                break
-                
-        except json.JSONDecodeError:
-            print(f"[ERROR] Invalid JSON command", flush=True)
-        except Exception as e:
-            print(f"[ERROR] {e}", flush=True)
\ No newline at end of file
@@ -0,0 +1,129 @@
+import concurrent.futures
+import contextlib
+import io
+import json
+import os
+import sys
+import threading
+import types
+import unittest
+import weakref
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import fast_engine as fe
+
+
+class FastDetectTest(unittest.TestCase):
+    def test_short_genuine_dialogue_is_left_to_the_llm(self):
+        # Line text as _detect_one passes it (timestamps stripped)
+        texts = ["Are you coming tonight?", "Yes, around eight.", "Great, see you."]
+        self.assertLess(fe._trigram_entropy(texts), fe.DETECT_ENTROPY_LOW)
+        self.assertIsNone(fe._fast_detect(texts))
+
+    def test_long_repetition_loop_is_rejected(self):
+        texts = ["I I I " * 40]
+        has_meeting, _, reason = fe._fast_detect(texts)
+        self.assertFalse(has_meeting)
+        self.assertIn("entropy", reason)
+
+
+class FakeModel:
+    def __init__(self, name):
+        self.name = name
+
+
+class SyncExecutor:
+    """Runs the background preload on submit, so it has finished before the first command."""
+    def __init__(self, max_workers=None):
+        pass
+
+    def submit(self, fn, *args):
+        future = concurrent.futures.Future()
+        future.set_result(fn(*args))
+        return future
+
+    def shutdown(self, wait=True):
+        pass
+
+
+class ServerModelCacheTest(unittest.TestCase):
+    VRAM_GB = 10
+
+    def run_server(self, commands, preload_gate=None):
+        """preload_gate: keep the preload in flight (memory already taken) until the server evicts."""
+        live = weakref.WeakSet()
+        loads = []
+        allocated = threading.Event()
+
+        def load(name, *args, **kwargs):
+            loads.append(name)
+            model = FakeModel(name)
+            live.add(model)
+            if preload_gate is not None and name == fe.SERVER_PRELOAD_MODEL:
+                allocated.set()
+                preload_gate.wait(5)
+            return model
+
+        def unload_llm():
+            if preload_gate is not None:
+                preload_gate.set()  # The server is trying to free memory: let the preload land
+            return False
+
+        def free_vram_gb():
+            return self.VRAM_GB - sum(fe.estimate_model_vram_gb(m.name) for m in live)
+
+        fake_vad = types.ModuleType("faster_whisper.vad")
+        fake_vad.get_vad_model = lambda: None
+        lines = [json.dumps(c) + "\n" for c in commands]
+        resident = set()
+
+        def readline():
+            if preload_gate is not None:
+                allocated.wait(5)
+            if lines:
+                return lines.pop(0)
+            resident.update(m.name for m in live)  # What the server holds once it is idle
+            return ""
+
+        stdin = mock.Mock(readline=readline)
+        out = io.StringIO()
+        with mock.patch.dict(sys.modules, {"faster_whisper": types.ModuleType("faster_whisper"),
+                                           "faster_whisper.vad": fake_vad}), \
+             mock.patch.object(concurrent.futures, "ThreadPoolExecutor",
+                               concurrent.futures.ThreadPoolExecutor if preload_gate else SyncExecutor), \
+             mock.patch.object(fe, "load_scout_model", lambda: load("tiny.en")), \
+             mock.patch.object(fe, "load_whisper_model", load), \
+             mock.patch.object(fe, "run_batch_transcriber", lambda *args, **kwargs: None), \
+             mock.patch.object(fe, "_free_vram_gb", free_vram_gb), \
+             mock.patch.object(fe, "_unload_llm", unload_llm), \
+             mock.patch.object(fe, "release_cuda_cache", lambda: None), \
+             mock.patch.object(fe, "DEVICE", "cuda"), \
+             mock.patch.object(sys, "stdin", stdin), \
+             contextlib.redirect_stdout(out):
+            fe.run_server()
+        return loads, resident
+
+    def test_finished_preload_is_evicted_for_another_model(self):
+        # large-v3 (preloaded) and medium don't fit together: the unused preload has to go
+        loads, live = self.run_server([{"action": "batch_transcribe", "model": "medium"}])
+        self.assertEqual(loads, ["tiny.en", fe.SERVER_PRELOAD_MODEL, "medium"])
+        self.assertEqual(live, {"tiny.en", "medium"})
+
+    def test_preload_in_flight_is_evicted_once_it_lands(self):
+        loads, live = self.run_server([{"action": "batch_transcribe", "model": "medium"}],
+                                      preload_gate=threading.Event())
+        self.assertEqual(loads, ["tiny.en", fe.SERVER_PRELOAD_MODEL, "medium"])
+        self.assertEqual(live, {"tiny.en", "medium"})
+
+    def test_finished_preload_counts_against_max_models(self):
+        self.VRAM_GB = 100
+        commands = [{"action": "batch_transcribe", "model": name} for name in ("small", "base")]
+        loads, live = self.run_server(commands)
+        self.assertEqual(loads, ["tiny.en", fe.SERVER_PRELOAD_MODEL, "small", "base"])
+        self.assertEqual(live, {"tiny.en", "small", "base"})
+
+
+if __name__ == "__main__":
+    unittest.main()
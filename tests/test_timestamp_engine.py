@@ -0,0 +1,61 @@
+import concurrent.futures
+import contextlib
+import io
+import json
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import timestamp_engine as te
+
+
+def _fake_strips(video_path, crop_ratio=0.08, hwaccel=False):
+    name = os.path.basename(video_path)
+    return 10.0, [f"{name}:start", f"{name}:end"]
+
+
+def _fake_ocr(strip):
+    # Every other strip is "read" by OCR, the rest go to the VLM
+    return None if strip.endswith(":end") else f"OCR {strip}"
+
+
+def _fake_vlm(model, processor, images):
+    return [f"VLM {image}" for image in images]
+
+
+class BatchRenameTest(unittest.TestCase):
+    def run_batch(self, count):
+        folder = tempfile.mkdtemp()
+        for i in range(count):
+            open(os.path.join(folder, f"cam_{i:03d}.mp4"), "w").close()
+
+        out = io.StringIO()
+        with mock.patch.object(te, "_extract_video_strips", _fake_strips), \
+             mock.patch.object(te, "_ocr_fast", _fake_ocr), \
+             mock.patch.object(te, "_read_timestamps_batch", _fake_vlm), \
+             mock.patch.object(te, "_load_vlm", lambda *args: (object(), object())), \
+             mock.patch.object(concurrent.futures, "ProcessPoolExecutor", concurrent.futures.ThreadPoolExecutor), \
+             contextlib.redirect_stdout(out):
+            te.run_batch_rename(folder)
+
+        return [json.loads(line[len("[BATCH_RESULT]"):]) for line in out.getvalue().splitlines()
+                if line.startswith("[BATCH_RESULT]")]
+
+    def test_every_video_is_read_past_the_lookahead_window(self):
+        # More videos than the extraction look-ahead (two groups) plus one more group
+        count = 3 * te.VLM_BATCH_FRAMES + 5
+        results = self.run_batch(count)
+
+        self.assertEqual([r["file"] for r in results], [f"cam_{i:03d}.mp4" for i in range(count)])
+        for r in results:
+            self.assertNotIn("error", r)
+            self.assertEqual(r["start_timestamp"], f"OCR {r['file']}:start")
+            self.assertEqual(r["end_timestamp"], f"VLM {r['file']}:end")
+
+
+if __name__ == "__main__":
+    unittest.main()
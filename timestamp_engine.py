@@ -4,16 +4,17 @@ Standalone script for the TurboScribe Timestamps tab.
 
 Usage:
   python timestamp_engine.py <video_file> [--num-frames 5] [--crop-ratio 0.08]
-  python timestamp_engine.py --batch-folder <folder> [--crop-ratio 0.08]
+  python timestamp_engine.py --batch-folder <folder> [--crop-ratio 0.08] [--hwaccel]
+  python timestamp_engine.py --server   (JSON commands on stdin: extract, batch_rename, ping, exit)
 """
 
 import argparse
 import json
 import os
+import re
 import sys
 import subprocess
 import tempfile
-import shutil
 
 # Force unbuffered output for real-time UI updates
 sys.stdout.reconfigure(encoding='utf-8', line_buffering=True)
@@ -21,11 +22,48 @@ sys.stdout.reconfigure(encoding='utf-8', line_buffering=True)
 # Globals for lazy-loaded VLM
 _vlm_model = None
 _vlm_processor = None
+_vlm_prompt_text = None  # Chat template rendered once; it is the same for every frame
 
+# VLM weight formats on CUDA: "none" = bf16, "int8"/"nf4" = bitsandbytes 8-bit / 4-bit weights
+VLM_QUANTS = ["auto", "none", "int8", "nf4"]
+# With "auto", GPUs with less VRAM than this get NF4 (the bf16 weights alone are ~16 GB)
+VLM_NF4_BELOW_GB = 16
 
-def _load_vlm():
-    """Load Qwen2.5-VL-7B model (cached after first load)."""
-    global _vlm_model, _vlm_processor
+# Prompt sent with every cropped frame
+TIMESTAMP_PROMPT = (
+    "Read the exact timestamp and camera name shown in this image. "
+    "Return ONLY the timestamp text in the format it appears, nothing else. "
+    "If no timestamp is visible, respond with 'NONE'."
+)
+
+# Frames read per generate() call. The cropped strips are small, so one batch shares the
+# prefill and decode steps; the cap keeps a long batch-rename run within VRAM.
+VLM_BATCH_FRAMES = 16
+
+# Answer length cap. Qwen splits numbers into single digits, so "2024-03-15 14:22:31" alone
+# is ~19 tokens; the rest covers a camera name. Rows that hit EOS early stop counting.
+VLM_MAX_NEW_TOKENS = 40
+
+# OCR fast path (RapidOCR, optional): a reading is used without the VLM only when every text
+# box clears this confidence and the joined text contains a date and a time
+OCR_MIN_CONFIDENCE = 0.9
+OCR_TIMESTAMP_RE = re.compile(r"(\d{4}[-/.]\d{1,2}[-/.]\d{1,2}|\d{1,2}[-/.]\d{1,2}[-/.]\d{4}).*\d{1,2}:\d{2}:\d{2}")
+_ocr_engine = None  # False once RapidOCR turned out to be unavailable
+
+# Videos decoded in parallel by batch rename (worker processes; the VLM stays in the main one)
+EXTRACT_WORKERS = min(4, os.cpu_count() or 1)
+
+# Cached PyAV hardware decoder config (False once it turned out to be unavailable)
+_hwaccel = None
+
+
+def _load_vlm(quant="auto", compile_model=False):
+    """
+    Load Qwen2.5-VL-7B model (cached after first load).
+    quant: weight format on CUDA, one of VLM_QUANTS (ignored on CPU);
+    compile_model: compile the forward pass with CUDA graphs (see _compile_vlm).
+    """
+    global _vlm_model, _vlm_processor, _vlm_prompt_text
     if _vlm_model is not None:
         return _vlm_model, _vlm_processor
 
@@ -38,6 +76,7 @@ def _load_vlm():
     except ImportError:
         print("[ERROR] Required packages not installed. Run:")
         print("[ERROR]   pip install transformers accelerate qwen-vl-utils torchvision Pillow")
+        print("[ERROR] Optional (faster attention on RTX 30-series and newer): pip install flash-attn")
         return None, None
 
     try:
@@ -60,30 +99,215 @@ def _load_vlm():
 
         dtype = torch.bfloat16 if use_cuda else torch.float32
         device_map = "auto" if use_cuda else "cpu"
-        print(f"[TIMESTAMP] Loading model on {'GPU (CUDA)' if use_cuda else 'CPU'}...")
+        load_args = {}
+
+        # Decode is bound by weight bandwidth: 8-bit/4-bit weights cut the bytes read per token
+        quant = quant if quant in VLM_QUANTS else "auto"
+        if not use_cuda:
+            quant = "none"
+        elif quant == "auto":
+            vram_gb = torch.cuda.get_device_properties(0).total_memory / 1024**3
+            quant = "nf4" if vram_gb < VLM_NF4_BELOW_GB else "none"
+        if quant != "none":
+            try:
+                import bitsandbytes  # noqa: F401 (backend of BitsAndBytesConfig)
+                from transformers import BitsAndBytesConfig
+                if quant == "nf4":
+                    load_args["quantization_config"] = BitsAndBytesConfig(
+                        load_in_4bit=True,
+                        bnb_4bit_compute_dtype=torch.bfloat16,
+                        bnb_4bit_quant_type="nf4",
+                        bnb_4bit_use_double_quant=True,
+                    )
+                else:
+                    load_args["quantization_config"] = BitsAndBytesConfig(load_in_8bit=True)
+            except ImportError:
+                print(f"[TIMESTAMP] bitsandbytes not installed — loading bf16 weights instead of {quant}.")
+                print("[TIMESTAMP] To enable quantized weights, run: pip install bitsandbytes")
+                quant = "none"
+
+        # FlashAttention-2 (Ampere+ with flash-attn installed), else PyTorch's fused SDPA kernels
+        import importlib.util
+        if use_cuda and torch.cuda.get_device_capability()[0] >= 8 and importlib.util.find_spec("flash_attn"):
+            load_args["attn_implementation"] = "flash_attention_2"
+        else:
+            load_args["attn_implementation"] = "sdpa"
+
+        weights = "bf16" if quant == "none" else quant
+        print(f"[TIMESTAMP] Loading model on {f'GPU (CUDA, {weights})' if use_cuda else 'CPU'}"
+              f" with {load_args['attn_implementation']} attention...")
 
-        _vlm_model = Qwen2_5_VLForConditionalGeneration.from_pretrained(
-            model_name,
-            torch_dtype=dtype,
-            device_map=device_map,
+        try:
+            _vlm_model = Qwen2_5_VLForConditionalGeneration.from_pretrained(
+                model_name,
+                torch_dtype=dtype,
+                device_map=device_map,
+                **load_args,
+            )
+        except Exception as e:
+            if load_args["attn_implementation"] != "flash_attention_2":
+                raise
+            # flash-attn present but unusable (version/ABI mismatch): SDPA is still fused
+            print(f"[TIMESTAMP] FlashAttention-2 unavailable ({e}), using sdpa attention.")
+            load_args["attn_implementation"] = "sdpa"
+            _vlm_model = Qwen2_5_VLForConditionalGeneration.from_pretrained(
+                model_name,
+                torch_dtype=dtype,
+                device_map=device_map,
+                **load_args,
+            )
+        try:
+            # Fast (torchvision) image processor: resize/normalize/patchify run as tensor ops,
+            # on the GPU when given a device
+            _vlm_processor = AutoProcessor.from_pretrained(model_name, use_fast=True)
+        except Exception:
+            _vlm_processor = AutoProcessor.from_pretrained(model_name)
+        # Batched generation appends to the end of each row, so prompts must be padded on the left
+        _vlm_processor.tokenizer.padding_side = "left"
+        # The template only emits an image placeholder, expanded by the processor per image
+        _vlm_prompt_text = _vlm_processor.apply_chat_template(
+            [{"role": "user", "content": [{"type": "image"}, {"type": "text", "text": TIMESTAMP_PROMPT}]}],
+            tokenize=False, add_generation_prompt=True,
         )
-        _vlm_processor = AutoProcessor.from_pretrained(model_name)
         print("[TIMESTAMP] Model loaded successfully.")
+        if compile_model and use_cuda:
+            _compile_vlm(_vlm_model, _vlm_processor)
         return _vlm_model, _vlm_processor
     except Exception as e:
         print(f"[ERROR] Failed to load VLM: {e}")
         return None, None
 
 
-def _extract_frames(video_path, num_frames=5):
-    """Extract evenly-spaced frames from a video file using ffmpeg."""
+def _compile_vlm(model, processor):
+    """
+    Compile the VLM forward pass with torch.compile (CUDA graphs). Decode steps are small
+    and launch-bound, so replaying captured graphs removes most per-step overhead.
+    Needs Triton; the first batch of each new shape pays the compile time.
+    """
+    import importlib.util
+    if importlib.util.find_spec("triton") is None:
+        print("[TIMESTAMP] torch.compile needs Triton, which is not installed — running uncompiled.")
+        return
+    try:
+        import torch
+        from PIL import Image
+        # Fixed-size KV cache: every decode step has the same shape, so its graph is replayed
+        model.generation_config.cache_implementation = "static"
+        model.forward = torch.compile(model.forward, mode="reduce-overhead", fullgraph=False)
+        print("[TIMESTAMP] Compiling VLM (one-time warm-up)...")
+        # Warm up on a typical 1920px-wide, 8% strip so the first real frame doesn't pay for compilation
+        _read_timestamps_batch(model, processor, [Image.new("RGB", (1920, 86))])
+        print("[TIMESTAMP] VLM compiled.")
+    except Exception as e:
+        print(f"[WARN] torch.compile failed ({e}), running uncompiled")
+
+
+def _frame_timestamps(duration, num_frames):
+    """Calculate timestamps for evenly spaced frames."""
+    if num_frames == 1:
+        return [duration / 2]
+    if num_frames == 2:
+        # Batch mode: first + last frame (avoid black frames at edges)
+        start = min(2.0, duration * 0.05)
+        end = max(duration - 2.0, duration * 0.95)
+        return [start, end]
+    # Avoid first/last 1 second to skip potential black frames
+    start = min(1.0, duration * 0.05)
+    end = max(duration - 1.0, duration * 0.95)
+    step = (end - start) / (num_frames - 1)
+    return [start + i * step for i in range(num_frames)]
+
+
+def _get_hwaccel():
+    """PyAV CUDA (NVDEC) decoder config, or None when this PyAV build has no hwaccel support."""
+    global _hwaccel
+    if _hwaccel is None:
+        try:
+            from av.codec.hwaccel import HWAccel
+            # Software decode takes over when there is no CUDA device or the codec isn't supported
+            _hwaccel = HWAccel(device_type="cuda", allow_software_fallback=True)
+            print("[TIMESTAMP] Using NVDEC hardware decoding where available")
+        except Exception:
+            print("[TIMESTAMP] Hardware decoding not supported by this PyAV build — decoding on CPU")
+            _hwaccel = False
+    return _hwaccel or None
+
+
+def _extract_frames_pyav(video_path, num_frames, hwaccel=False, crop_ratio=None):
+    """
+    Decode the sampled frames in-process with PyAV (the "av" package), as
+    in-memory PIL images: no ffprobe/ffmpeg processes and no JPEG round trip through disk.
+    hwaccel: decode on the GPU's video engine (NVDEC) when available;
+    crop_ratio: return only the timestamp strips (see _extract_frames).
+    Returns (frames, duration), or None to fall back to ffmpeg.
+    """
+    try:
+        import av
+    except ImportError:
+        return None
+
+    try:
+        open_args = {}
+        accel = _get_hwaccel() if hwaccel else None
+        if accel is not None:
+            open_args["hwaccel"] = accel
+        with av.open(video_path, **open_args) as container:
+            stream = container.streams.video[0]
+            stream.thread_type = "AUTO"
+            if container.duration:
+                duration = container.duration / av.time_base
+            elif stream.duration:
+                duration = float(stream.duration * stream.time_base)
+            else:
+                return None
+            if duration <= 0:
+                return None
+
+            print(f"[TIMESTAMP] Video duration: {duration:.1f}s")
+
+            frames = []
+            for ts in _frame_timestamps(duration, num_frames):
+                # Seek lands on the keyframe before ts; decode forward to the first frame at ts
+                container.seek(int(ts / stream.time_base), stream=stream)
+                picked = None
+                for frame in container.decode(stream):
+                    picked = frame
+                    if frame.time is not None and frame.time >= ts:
+                        break
+                if picked is None:
+                    print(f"[WARN] Frame at {ts:.1f}s could not be decoded")
+                    continue
+                image = picked.to_image()
+                if crop_ratio is not None:
+                    image = _crop_timestamp_region(image, crop_ratio)
+                frames.append({"path": None, "image": image, "timestamp_sec": ts})
+    except Exception as e:
+        print(f"[WARN] In-process decode failed ({e}), using ffmpeg")
+        return None
+
+    if not frames:
+        return None
+    return frames, duration
+
+
+def _extract_frames(video_path, tmp_dir, num_frames=5, hwaccel=False, crop_ratio=None):
+    """
+    Extract evenly-spaced frames from a video file (in-process via PyAV, else with ffmpeg).
+    tmp_dir: caller-owned directory for the ffmpeg frame files; hwaccel: let PyAV decode with NVDEC;
+    crop_ratio: when given, every frame's "image" is its cropped timestamp strip, loaded in memory
+    (ffmpeg then crops before encoding, so only the strip is written and decoded as JPEG).
+    """
+    decoded = _extract_frames_pyav(video_path, num_frames, hwaccel, crop_ratio)
+    if decoded is not None:
+        return decoded
+
     # Get video duration via ffprobe
-    probe_cmd = [
-        "ffprobe", "-v", "error",
-        "-show_entries", "format=duration",
-        "-of", "csv=p=0", video_path
-    ]
     try:
+        probe_cmd = [
+            "ffprobe", "-v", "error",
+            "-show_entries", "format=duration",
+            "-of", "csv=p=0", video_path
+        ]
         duration = float(subprocess.check_output(probe_cmd, stderr=subprocess.DEVNULL).decode().strip())
     except Exception as e:
         print(f"[ERROR] ffprobe failed: {e}")
@@ -96,128 +320,206 @@ def _extract_frames(video_path, num_frames=5):
 
     print(f"[TIMESTAMP] Video duration: {duration:.1f}s")
 
-    # Calculate timestamps for evenly spaced frames
-    if num_frames == 1:
-        timestamps = [duration / 2]
-    elif num_frames == 2:
-        # Batch mode: first + last frame (avoid black frames at edges)
-        start = min(2.0, duration * 0.05)
-        end = max(duration - 2.0, duration * 0.95)
-        timestamps = [start, end]
-    else:
-        # Avoid first/last 1 second to skip potential black frames
-        start = min(1.0, duration * 0.05)
-        end = max(duration - 1.0, duration * 0.95)
-        step = (end - start) / (num_frames - 1)
-        timestamps = [start + i * step for i in range(num_frames)]
+    timestamps = _frame_timestamps(duration, num_frames)
 
     frames = []
-    tmp_dir = tempfile.mkdtemp(prefix="ts_frames_")
-
-    for i, ts in enumerate(timestamps):
-        out_path = os.path.join(tmp_dir, f"frame_{i:03d}.jpg")
-        cmd = [
-            "ffmpeg", "-y", "-ss", f"{ts:.2f}",
-            "-i", video_path,
-            "-vframes", "1", "-q:v", "2",
-            out_path
-        ]
-        try:
-            subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=True)
-            if os.path.exists(out_path) and os.path.getsize(out_path) > 0:
-                frames.append({"path": out_path, "timestamp_sec": ts})
-            else:
-                print(f"[WARN] Frame at {ts:.1f}s produced empty file")
-        except Exception as e:
-            print(f"[WARN] Frame at {ts:.1f}s failed: {e}")
+    out_paths = [os.path.join(tmp_dir, f"frame_{i:03d}.jpg") for i in range(len(timestamps))]
+    # Same strip as _crop_timestamp_region (at least 10 px), rounded to even rows for 4:2:0 JPEG
+    crop_args = [] if crop_ratio is None else ["-vf", f"crop=iw:'max(10,trunc(ih*{crop_ratio}/2)*2)':0:0"]
+
+    # One ffmpeg process for all frames: the video is added once per timestamp as a
+    # separately seeked input (input seeking, as before), and input i feeds output i
+    cmd = ["ffmpeg", "-y"]
+    for ts in timestamps:
+        cmd += ["-ss", f"{ts:.2f}", "-i", video_path]
+    for i, out_path in enumerate(out_paths):
+        cmd += ["-map", f"{i}:v:0", *crop_args, "-vframes", "1", "-q:v", "2", out_path]
+    try:
+        subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=True)
+    except Exception as e:
+        # A single unreadable seek fails the whole command: retry frame by frame
+        print(f"[WARN] Single-pass frame extraction failed ({e}), extracting frames one by one")
+        for ts, out_path in zip(timestamps, out_paths):
+            cmd = [
+                "ffmpeg", "-y", "-ss", f"{ts:.2f}",
+                "-i", video_path, *crop_args,
+                "-vframes", "1", "-q:v", "2",
+                out_path
+            ]
+            try:
+                subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=True)
+            except Exception as frame_error:
+                print(f"[WARN] Frame at {ts:.1f}s failed: {frame_error}")
+
+    for ts, out_path in zip(timestamps, out_paths):
+        if not (os.path.exists(out_path) and os.path.getsize(out_path) > 0):
+            print(f"[WARN] Frame at {ts:.1f}s produced empty file")
+            continue
+        frame = {"path": out_path, "timestamp_sec": ts}
+        if crop_ratio is not None:
+            try:
+                from PIL import Image
+                with Image.open(out_path) as strip:
+                    strip.load()  # Decode now: the caller's temp directory goes away
+                    frame["image"] = strip.copy()
+            except Exception as e:
+                print(f"[WARN] Frame at {ts:.1f}s could not be read: {e}")
+                continue
+        frames.append(frame)
 
     return frames, duration
 
 
-def _crop_timestamp_region(image_path, crop_ratio=0.08):
-    """Crop the top portion of an image where timestamps typically appear."""
+def _crop_timestamp_region(image, crop_ratio=0.08):
+    """
+    Crop the top portion of an image where timestamps typically appear.
+    image: a frame file or an already decoded PIL image; the crop is returned as a PIL image
+    (kept in memory, never re-encoded to disk).
+    """
     try:
         from PIL import Image
-        img = Image.open(image_path)
-        w, h = img.size
-        crop_h = int(h * crop_ratio)
-        if crop_h < 10:
-            crop_h = 10
-        cropped = img.crop((0, 0, w, crop_h))
-        cropped_path = image_path.replace(".jpg", "_crop.jpg")
-        cropped.save(cropped_path, quality=95)
-        return cropped_path
+        if not isinstance(image, Image.Image):
+            image = Image.open(image)
+        w, h = image.size
+        crop_h = max(10, int(h * crop_ratio))
+        return image.crop((0, 0, w, crop_h))
     except ImportError:
         print("[WARN] Pillow not installed, using full frame")
-        return image_path
+        return image
     except Exception as e:
         print(f"[WARN] Crop failed: {e}, using full frame")
-        return image_path
+        return image
 
 
-def _read_timestamp_from_image(model, processor, image_path):
-    """Use VLM to read timestamp text from an image."""
-    try:
-        from PIL import Image
-        from qwen_vl_utils import process_vision_info
+def _dhash(image):
+    """
+    Difference hash of a timestamp strip: the sign of each horizontal brightness step on
+    a grayscale copy at a quarter of the width (about 4 px per bit, so one changed digit
+    flips bits). Equal hashes mean the strips show the same text.
+    """
+    width = max(9, image.width // 4 + 1)
+    gray = image.convert("L").resize((width, 16))
+    pixels = gray.tobytes()
+    bits = 0
+    for row in range(0, len(pixels), width):
+        for x in range(row, row + width - 1):
+            bits = (bits << 1) | (pixels[x] < pixels[x + 1])
+    return bits
 
-        image = Image.open(image_path)
 
-        prompt = (
-            "Read the exact timestamp and camera name shown in this image. "
-            "Return ONLY the timestamp text in the format it appears, nothing else. "
-            "If no timestamp is visible, respond with 'NONE'."
-        )
+def _ocr_fast(image):
+    """
+    Read a timestamp strip with RapidOCR (a small ONNX text detector + recognizer, a few ms
+    per strip on CPU). Returns the text, or None when OCR is unavailable or not confident
+    enough, in which case the strip goes to the VLM.
+    """
+    global _ocr_engine
+    if _ocr_engine is None:
+        try:
+            from rapidocr_onnxruntime import RapidOCR
+            _ocr_engine = RapidOCR()
+            print("[TIMESTAMP] RapidOCR fast path enabled")
+        except Exception:
+            _ocr_engine = False
+    if not _ocr_engine:
+        return None
 
-        messages = [
-            {
-                "role": "user",
-                "content": [
-                    {"type": "image", "image": image},
-                    {"type": "text", "text": prompt},
-                ],
-            }
-        ]
+    try:
+        import numpy as np
+        # RapidOCR takes BGR arrays (OpenCV order)
+        boxes, _ = _ocr_engine(np.asarray(image.convert("RGB"))[:, :, ::-1])
+    except Exception:
+        return None
+    if not boxes or any(float(score) < OCR_MIN_CONFIDENCE for _, _, score in boxes):
+        return None
 
-        text = processor.apply_chat_template(messages, tokenize=False, add_generation_prompt=True)
-        image_inputs, video_inputs = process_vision_info(messages)
-        inputs = processor(
-            text=[text],
-            images=image_inputs,
-            videos=video_inputs,
-            padding=True,
-            return_tensors="pt",
-        ).to(model.device)
-
-        generated_ids = model.generate(**inputs, max_new_tokens=128)
-        generated_ids_trimmed = [
-            out_ids[len(in_ids):] for in_ids, out_ids in zip(inputs.input_ids, generated_ids)
-        ]
-        output_text = processor.batch_decode(
-            generated_ids_trimmed, skip_special_tokens=True, clean_up_tokenization_spaces=False
-        )[0].strip()
+    # Left to right, as the text reads across the strip
+    text = " ".join(t.strip() for box, t, _ in sorted(boxes, key=lambda b: min(p[0] for p in b[0])))
+    return text if OCR_TIMESTAMP_RE.search(text) else None
 
-        return output_text
 
-    except Exception as e:
-        print(f"[ERROR] VLM inference failed: {e}")
-        return "ERROR"
+def _read_timestamps_batch(model, processor, images):
+    """
+    Use VLM to read timestamp text from several images (PIL images or files),
+    VLM_BATCH_FRAMES per generate() call.
+    """
+    results = []
+    for i in range(0, len(images), VLM_BATCH_FRAMES):
+        chunk = images[i:i + VLM_BATCH_FRAMES]
+        try:
+            from PIL import Image
+            from qwen_vl_utils import process_vision_info
+
+            messages_list = [
+                [
+                    {
+                        "role": "user",
+                        "content": [
+                            {"type": "image", "image": Image.open(image) if isinstance(image, str) else image},
+                            {"type": "text", "text": TIMESTAMP_PROMPT},
+                        ],
+                    }
+                ]
+                for image in chunk
+            ]
+
+            prompt_text = _vlm_prompt_text or processor.apply_chat_template(
+                messages_list[0], tokenize=False, add_generation_prompt=True)
+            texts = [prompt_text] * len(chunk)
+            image_inputs, video_inputs = process_vision_info(messages_list)
+            device_kwargs = {}
+            if model.device.type == "cuda" and type(processor.image_processor).__name__.endswith("Fast"):
+                # Pixels are uploaded once as uint8 and preprocessed on the GPU, not as float32 on the CPU
+                device_kwargs["device"] = model.device
+            inputs = processor(
+                text=texts,
+                images=image_inputs,
+                videos=video_inputs,
+                padding=True,
+                return_tensors="pt",
+                **device_kwargs,
+            ).to(model.device)
+
+            # Greedy decoding: the answer is transcribed text, sampling can only add misreadings
+            generated_ids = model.generate(
+                **inputs,
+                max_new_tokens=VLM_MAX_NEW_TOKENS,
+                do_sample=False,
+                num_beams=1,
+                temperature=None,  # Unset the checkpoint's sampling defaults (no warnings)
+                top_p=None,
+                top_k=None,
+                use_cache=True,
+                pad_token_id=processor.tokenizer.pad_token_id,
+            )
+            # Rows are left-padded to one length, so every answer starts at the same column
+            generated_ids_trimmed = generated_ids[:, inputs.input_ids.shape[1]:]
+            output_texts = processor.batch_decode(
+                generated_ids_trimmed, skip_special_tokens=True, clean_up_tokenization_spaces=False
+            )
+            results.extend(text.strip() for text in output_texts)
+
+        except Exception as e:
+            print(f"[ERROR] VLM inference failed: {e}")
+            results.extend("ERROR" for _ in chunk)
+
+    return results
 
 
 def _find_consensus(timestamps):
     """Find consensus among extracted timestamps using majority voting."""
-    from collections import Counter
-
-    valid = [t for t in timestamps if t and t != "NONE" and t != "ERROR"]
-    if not valid:
+    counts = {}
+    for t in timestamps:
+        if t and t != "NONE" and t != "ERROR":
+            counts[t] = counts.get(t, 0) + 1
+    if not counts:
         return None
 
-    counter = Counter(valid)
-    most_common = counter.most_common(1)[0][0]
-    return most_common
+    # max() keeps the first reading among equal counts, as Counter.most_common did
+    return max(counts, key=counts.get)
 
 
-def run_extract_timestamps(file_path, num_frames=5, crop_ratio=0.08):
+def run_extract_timestamps(file_path, num_frames=5, crop_ratio=0.08, quant="auto", compile_model=False):
     """
     Extract burned-in timestamps from video frames using Qwen2.5-VL.
     Samples multiple frames and uses majority voting for accuracy.
@@ -229,38 +531,52 @@ def run_extract_timestamps(file_path, num_frames=5, crop_ratio=0.08):
     print(f"[TIMESTAMP] Processing: {file_path}")
     print(f"[TIMESTAMP] Extracting {num_frames} frames...")
 
-    # Step 1: Extract frames
-    frames, duration = _extract_frames(file_path, num_frames)
-    if not frames:
-        print("[ERROR] No frames could be extracted. Is ffmpeg installed?")
-        return
+    # Step 1: Extract and crop frames (cropped strips are in memory, so the frame files can go)
+    with tempfile.TemporaryDirectory(prefix="ts_frames_") as tmp_dir:
+        frames, duration = _extract_frames(file_path, tmp_dir, num_frames, crop_ratio=crop_ratio)
+        if not frames:
+            print("[ERROR] No frames could be extracted. Is ffmpeg installed?")
+            return
 
-    print(f"[TIMESTAMP] Extracted {len(frames)} frames")
+        print(f"[TIMESTAMP] Extracted {len(frames)} frames")
+        cropped = [frame["image"] for frame in frames]
 
-    # Step 2: Load VLM
-    model, processor = _load_vlm()
-    if model is None:
-        return
+    # Step 2: Strips identical to an earlier one (frozen or slow-changing footage)
+    # reuse its reading instead of being read again
+    try:
+        hashes = [_dhash(strip) for strip in cropped]
+    except Exception:
+        hashes = list(range(len(cropped)))  # Not hashable (e.g. crop fallback): read every frame
+    first_index = {}
+    for i, h in enumerate(hashes):
+        first_index.setdefault(h, i)
+    unique = sorted(first_index.values())
+    if len(unique) < len(cropped):
+        print(f"[TIMESTAMP] {len(cropped) - len(unique)} duplicate frame(s) reuse an earlier reading")
+
+    # Step 3: OCR fast path; the VLM is loaded and run (in one batch) only for strips it can't read
+    unique_texts = {i: _ocr_fast(cropped[i]) for i in unique}
+    pending = [i for i in unique if unique_texts[i] is None]
+    if len(pending) < len(unique):
+        print(f"[TIMESTAMP] OCR read {len(unique) - len(pending)}/{len(unique)} frame(s)")
+    if pending:
+        model, processor = _load_vlm(quant, compile_model)
+        if model is None:
+            return
+        print(f"[TIMESTAMP] Reading {len(pending)} frames...")
+        unique_texts.update(zip(pending, _read_timestamps_batch(model, processor, [cropped[i] for i in pending])))
+    raw_texts = [unique_texts[first_index[h]] for h in hashes]
 
-    # Step 3: Process each frame
     results = []
-    for i, frame in enumerate(frames):
+    for i, (frame, raw_text) in enumerate(zip(frames, raw_texts)):
         ts_sec = frame["timestamp_sec"]
-        print(f"[TIMESTAMP] Reading frame {i+1}/{len(frames)} (at {ts_sec:.1f}s)...")
-
-        # Crop timestamp region
-        cropped = _crop_timestamp_region(frame["path"], crop_ratio)
-
-        # Read timestamp with VLM
-        raw_text = _read_timestamp_from_image(model, processor, cropped)
-
         confidence = "high" if raw_text and raw_text != "NONE" and raw_text != "ERROR" else "low"
         results.append({
             "frame_sec": round(ts_sec, 1),
             "raw_text": raw_text,
             "confidence": confidence,
         })
-        print(f"[TIMESTAMP] Frame {i+1}: {raw_text} ({confidence})")
+        print(f"[TIMESTAMP] Frame {i+1} (at {ts_sec:.1f}s): {raw_text} ({confidence})")
 
     # Step 4: Find consensus
     all_texts = [r["raw_text"] for r in results]
@@ -288,40 +604,59 @@ def run_extract_timestamps(file_path, num_frames=5, crop_ratio=0.08):
     # Output JSON for the C# app to parse
     print(f"[TIMESTAMP_RESULT] {json.dumps(output)}")
 
-    # Cleanup temp frames
-    for frame in frames:
-        tmp_dir = os.path.dirname(frame["path"])
-        if "ts_frames_" in tmp_dir:
-            try:
-                shutil.rmtree(tmp_dir)
-            except Exception:
-                pass
-            break
-
     return output
 
 
-def run_batch_rename(folder_path, crop_ratio=0.08, recursive=False, prefix=None):
+def _extract_video_strips(video_path, crop_ratio=0.08, hwaccel=False):
+    """
+    Batch-rename worker job: extract the first + last frames of one video and crop them
+    (in memory, so the frame files are removed right away). Returns (duration, cropped).
+    """
+    with tempfile.TemporaryDirectory(prefix="ts_frames_") as tmp_dir:
+        frames, duration = _extract_frames(video_path, tmp_dir, num_frames=2, hwaccel=hwaccel, crop_ratio=crop_ratio)
+    return duration, [frame["image"] for frame in frames]
+
+
+def _iter_mp4(root, recursive=False, prefix=None):
+    """
+    Yield the .mp4 files under root (any case, like glob on Windows), optionally only
+    those whose name starts with prefix. One os.scandir pass per directory: names and
+    types come from the directory listing, without a stat per file.
+    Hidden (dot) files and folders are skipped, as glob did.
+    """
+    prefix_lower = prefix.lower() if prefix else ""
+    stack = [root]
+    while stack:
+        try:
+            with os.scandir(stack.pop()) as it:
+                for entry in it:
+                    name = entry.name
+                    if name.startswith("."):
+                        continue
+                    if recursive and entry.is_dir():
+                        stack.append(entry.path)
+                        continue
+                    lower = name.lower()
+                    if lower.startswith(prefix_lower) and lower.endswith(".mp4") and entry.is_file():
+                        yield entry.path
+        except OSError:
+            continue  # Unreadable folder: skip it, as glob does
+
+
+def run_batch_rename(folder_path, crop_ratio=0.08, recursive=False, prefix=None, hwaccel=False, quant="auto",
+                     compile_model=False):
     """
     Process all .mp4 files in a folder, extracting start/end timestamps
     for batch renaming. Uses only 2 frames per video for speed.
+    hwaccel: decode the videos with NVDEC instead of on the CPU.
     """
-    import glob
-
     if not os.path.isdir(folder_path):
         print(f"[ERROR] Folder not found: {folder_path}")
         return
 
-    if recursive:
-        mp4_files = sorted(glob.glob(os.path.join(folder_path, "**", "*.mp4"), recursive=True))
-        scope = f"{folder_path} (including subfolders)"
-    else:
-        mp4_files = sorted(glob.glob(os.path.join(folder_path, "*.mp4")))
-        scope = folder_path
-
-    # Filter by prefix if specified
+    mp4_files = sorted(_iter_mp4(folder_path, recursive, prefix))
+    scope = f"{folder_path} (including subfolders)" if recursive else folder_path
     if prefix:
-        mp4_files = [f for f in mp4_files if os.path.basename(f).lower().startswith(prefix.lower())]
         scope += f" [prefix: {prefix}]"
 
     if not mp4_files:
@@ -331,85 +666,157 @@ def run_batch_rename(folder_path, crop_ratio=0.08, recursive=False, prefix=None)
     print(f"[BATCH] Found {len(mp4_files)} video(s) in {scope}")
 
     # Pre-load VLM once for all videos
-    model, processor = _load_vlm()
+    model, processor = _load_vlm(quant, compile_model)
     if model is None:
         print("[ERROR] Cannot load VLM model — aborting batch.")
         return
 
-    for idx, video_path in enumerate(mp4_files):
-        filename = os.path.basename(video_path)
-        print(f"\n[BATCH] Processing {idx+1}/{len(mp4_files)}: {filename}")
-
-        # Extract only 2 frames: first + last
-        frames, duration = _extract_frames(video_path, num_frames=2)
-        if len(frames) < 2:
-            print(f"[BATCH] Skipping {filename} — could not extract 2 frames")
-            result = {
-                "file": filename,
-                "path": os.path.abspath(video_path),
-                "start_timestamp": None,
-                "end_timestamp": None,
-                "error": "Could not extract frames"
-            }
-            print(f"[BATCH_RESULT] {json.dumps(result)}")
-            # Cleanup
-            _cleanup_frames(frames)
-            continue
+    # Videos are handled in groups whose start/end frames share one VLM batch
+    group_size = max(1, VLM_BATCH_FRAMES // 2)
+
+    # Videos are decoded in worker processes (ffmpeg/PyAV, CPU) while the VLM reads the
+    # current group (GPU); at most two groups are extracted ahead, bounding memory
+    from concurrent.futures import ProcessPoolExecutor
+    lookahead = 2 * group_size
+    with ProcessPoolExecutor(max_workers=EXTRACT_WORKERS) as extractor:
+        pending = {}
+
+        def submit(idx):
+            if idx < len(mp4_files):
+                pending[idx] = extractor.submit(_extract_video_strips, mp4_files[idx], crop_ratio, hwaccel)
+
+        for idx in range(lookahead):
+            submit(idx)
+
+        for group_start in range(0, len(mp4_files), group_size):
+            group = []
+            for idx in range(group_start, min(group_start + group_size, len(mp4_files))):
+                video_path = mp4_files[idx]
+                filename = os.path.basename(video_path)
+                print(f"\n[BATCH] Processing {idx+1}/{len(mp4_files)}: {filename}")
+                try:
+                    duration, cropped = pending.pop(idx).result()
+                except Exception as e:
+                    print(f"[WARN] Frame extraction failed: {e}")
+                    duration, cropped = 0, []
+                submit(idx + lookahead)
+
+                if len(cropped) < 2:
+                    print(f"[BATCH] Skipping {filename} — could not extract 2 frames")
+                    result = {
+                        "file": filename,
+                        "path": os.path.abspath(video_path),
+                        "start_timestamp": None,
+                        "end_timestamp": None,
+                        "error": "Could not extract frames"
+                    }
+                    print(f"[BATCH_RESULT] {json.dumps(result)}")
+                    continue
+                group.append((video_path, duration, cropped))
+
+            if not group:
+                continue
+
+            # OCR fast path first; only the strips it can't read go to the VLM batch
+            strips = [c for *_, cropped in group for c in cropped]
+            raw_texts = [_ocr_fast(strip) for strip in strips]
+            ocr_misses = [i for i, raw in enumerate(raw_texts) if raw is None]
+            if ocr_misses:
+                for i, raw in zip(ocr_misses, _read_timestamps_batch(model, processor, [strips[i] for i in ocr_misses])):
+                    raw_texts[i] = raw
+
+            for g, (video_path, duration, _) in enumerate(group):
+                filename = os.path.basename(video_path)
+                print(f"[BATCH] {filename}:")
+                start_text = None
+                end_text = None
+
+                for i, raw in enumerate(raw_texts[2 * g:2 * g + 2]):
+                    if raw and raw != "NONE" and raw != "ERROR":
+                        if i == 0:
+                            start_text = raw
+                        else:
+                            end_text = raw
+                    label = "start" if i == 0 else "end"
+                    print(f"[BATCH]   {label}: {raw}")
+
+                result = {
+                    "file": filename,
+                    "path": os.path.abspath(video_path),
+                    "start_timestamp": start_text,
+                    "end_timestamp": end_text,
+                    "duration_sec": round(duration, 1)
+                }
+                print(f"[BATCH_RESULT] {json.dumps(result)}")
 
-        start_text = None
-        end_text = None
+    print(f"\n[BATCH] Done — processed {len(mp4_files)} videos.")
 
-        for i, frame in enumerate(frames):
-            cropped = _crop_timestamp_region(frame["path"], crop_ratio)
-            raw = _read_timestamp_from_image(model, processor, cropped)
-            if raw and raw != "NONE" and raw != "ERROR":
-                if i == 0:
-                    start_text = raw
-                else:
-                    end_text = raw
-            label = "start" if i == 0 else "end"
-            print(f"[BATCH]   {label}: {raw}")
-
-        result = {
-            "file": filename,
-            "path": os.path.abspath(video_path),
-            "start_timestamp": start_text,
-            "end_timestamp": end_text,
-            "duration_sec": round(duration, 1)
-        }
-        print(f"[BATCH_RESULT] {json.dumps(result)}")
-
-        # Cleanup temp frames
-        _cleanup_frames(frames)
 
-    print(f"\n[BATCH] Done — processed {len(mp4_files)} videos.")
+def run_server(quant="auto", compile_model=False):
+    """
+    Persistent engine: reads one JSON command per line from stdin.
+    The VLM is loaded once and stays resident, so each video or folder after the
+    first skips the ~15 GB weight load and CUDA init.
+    """
+    print("[SERVER] Initializing timestamp engine...", flush=True)
+    model, _ = _load_vlm(quant, compile_model)
+    if model is None:
+        print("[SERVER] Init failed: VLM could not be loaded", flush=True)
+        return
+    print("[SERVER] Engine ready.", flush=True)
 
+    while True:
+        try:
+            line = sys.stdin.readline()
+            if not line: break
 
-def _cleanup_frames(frames):
-    """Remove temporary frame files."""
-    for frame in frames:
-        tmp_dir = os.path.dirname(frame["path"])
-        if "ts_frames_" in tmp_dir:
-            try:
-                shutil.rmtree(tmp_dir)
-            except Exception:
-                pass
-            break
+            cmd = json.loads(line)
+            action = cmd.get("action")
+
+            if action == "ping":
+                print(json.dumps({"status": "pong"}), flush=True)
+
+            elif action == "extract":
+                output = run_extract_timestamps(cmd.get("file", ""), num_frames=cmd.get("num_frames", 5),
+                                                crop_ratio=cmd.get("crop_ratio", 0.08))
+                print(json.dumps({"status": "complete" if output else "error", "action": "extract"}), flush=True)
+
+            elif action == "batch_rename":
+                run_batch_rename(cmd.get("folder", ""), crop_ratio=cmd.get("crop_ratio", 0.08),
+                                 recursive=cmd.get("recursive", False), prefix=cmd.get("prefix"),
+                                 hwaccel=cmd.get("hwaccel", False))
+                print(json.dumps({"status": "complete", "action": "batch_rename"}), flush=True)
+
+            elif action == "exit":
+                break
+
+        except json.JSONDecodeError:
+            print(f"[ERROR] Invalid JSON command", flush=True)
+        except Exception as e:
+            print(f"[ERROR] {e}", flush=True)
 
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Extract burned-in timestamps from video files using Qwen2.5-VL-7B")
     parser.add_argument("file", nargs="?", help="Path to video file")
+    parser.add_argument("--server", action="store_true", help="Keep the VLM loaded and read JSON commands from stdin")
     parser.add_argument("--batch-folder", help="Process all .mp4 files in a folder (batch rename mode)")
     parser.add_argument("--recursive", action="store_true", help="Include subfolders when using --batch-folder")
     parser.add_argument("--prefix", help="Only process files starting with this prefix (e.g., 'reo')")
     parser.add_argument("--num-frames", type=int, default=5, help="Number of frames to extract (default: 5)")
+    parser.add_argument("--hwaccel", action="store_true", help="Decode videos with NVDEC (CUDA) in batch mode; needs a PyAV build with hwaccel support")
+    parser.add_argument("--quant", choices=VLM_QUANTS, default="auto", help=f"VLM weight format on CUDA (default: auto = nf4 below {VLM_NF4_BELOW_GB} GB VRAM, else bf16)")
+    parser.add_argument("--compile", action="store_true", help="Compile the VLM with torch.compile (CUDA + Triton; slow first batch, faster afterwards)")
     parser.add_argument("--crop-ratio", type=float, default=0.08, help="Fraction of frame height to crop from top (default: 0.08)")
     args = parser.parse_args()
 
-    if args.batch_folder:
-        run_batch_rename(args.batch_folder, crop_ratio=args.crop_ratio, recursive=args.recursive, prefix=args.prefix)
+    if args.server:
+        run_server(quant=args.quant, compile_model=args.compile)
+    elif args.batch_folder:
+        run_batch_rename(args.batch_folder, crop_ratio=args.crop_ratio, recursive=args.recursive, prefix=args.prefix,
+                         hwaccel=args.hwaccel, quant=args.quant, compile_model=args.compile)
     elif args.file:
-        run_extract_timestamps(args.file, num_frames=args.num_frames, crop_ratio=args.crop_ratio)
+        run_extract_timestamps(args.file, num_frames=args.num_frames, crop_ratio=args.crop_ratio, quant=args.quant,
+                               compile_model=args.compile)
     else:
         parser.print_help()